@@ -0,0 +1,109 @@
+# api/batching.py
+
+import asyncio
+import os
+import time
+
+from starlette.concurrency import run_in_threadpool
+
+# Maximum latency batching may add to a request, waiting for others to join
+# plus running the batch; 0 disables batching
+BATCH_MAX_WAIT_MS = float(os.environ.get("VALUATION_BATCH_MAX_WAIT_MS", "2"))
+BATCH_MAX_SIZE = int(os.environ.get("VALUATION_BATCH_MAX_SIZE", "64"))
+
+
+class MicroBatcher:
+    """
+    Collects concurrent calls and evaluates them with one `batch_func(items)`
+    call in the threadpool. Each caller gets its own result; if the batch call
+    raises, the items are retried one by one so a bad payload only fails its
+    own caller.
+
+    `max_wait_ms` bounds the waiting plus the batch execution: the batch is
+    flushed once the oldest item has waited so long that running the pending
+    items (estimated from past batches) would take it past the bound, or when
+    `max_batch_size` items are waiting. The per-item estimate is the smoothed
+    batch time divided by its size, which includes the fixed per-batch cost and
+    therefore errs on the short side.
+    """
+
+    def __init__(self, batch_func, max_batch_size: int = BATCH_MAX_SIZE, max_wait_ms: float = BATCH_MAX_WAIT_MS):
+        self.batch_func = batch_func
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000
+        self._pending = []
+        self._first_pending_at = None
+        self._timer = None
+        self._running = set()
+        self.item_seconds = 0.0
+        self.batches = 0
+        self.items = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_wait > 0 and self.max_batch_size > 1
+
+    async def submit(self, item):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if not self._pending:
+            self._first_pending_at = loop.time()
+        self._pending.append((item, future))
+        flush_at = self._first_pending_at + self.max_wait - self.item_seconds * len(self._pending)
+        if len(self._pending) >= self.max_batch_size or flush_at <= loop.time():
+            self._flush()
+        else:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = loop.call_at(flush_at, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: list):
+        self.batches += 1
+        self.items += len(batch)
+        items = [item for item, _ in batch]
+        try:
+            started = time.perf_counter()
+            results = await run_in_threadpool(self.batch_func, items)
+            self._record(time.perf_counter() - started, len(items))
+            outcomes = [(True, result) for result in results]
+        except Exception:
+            outcomes = [await self._run_single(item) for item in items]
+        for (_, future), (ok, value) in zip(batch, outcomes):
+            if future.done():  # caller went away
+                continue
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    async def _run_single(self, item) -> tuple:
+        try:
+            return True, (await run_in_threadpool(self.batch_func, [item]))[0]
+        except Exception as e:
+            return False, e
+
+    def _record(self, elapsed: float, size: int):
+        per_item = elapsed / size
+        self.item_seconds = per_item if not self.item_seconds else 0.8 * self.item_seconds + 0.2 * per_item
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "max_wait_ms": self.max_wait * 1000,
+            "max_batch_size": self.max_batch_size,
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": self.items / self.batches if self.batches else 0.0,
+            "estimated_item_ms": self.item_seconds * 1000,
+        }
@@ -0,0 +1,107 @@
+# api/capture.py
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import threading
+import time
+
+from core.calculation_engine import MONEY_FIELDS
+
+# Capture is off unless a directory is configured
+CAPTURE_DIR = os.environ.get("VALUATION_CAPTURE_DIR", "")
+CAPTURE_SAMPLE_RATE = float(os.environ.get("VALUATION_CAPTURE_SAMPLE_RATE", "0.01"))
+CAPTURE_MAX_BYTES = int(os.environ.get("VALUATION_CAPTURE_MAX_BYTES", str(50 * 1024 * 1024)))
+CAPTURE_BACKUP_COUNT = int(os.environ.get("VALUATION_CAPTURE_BACKUP_COUNT", "10"))
+CAPTURE_FILENAME = "estimate_requests.jsonl"
+
+_logger = None
+_logger_lock = threading.Lock()
+
+
+class _RecordFormatter(logging.Formatter):
+    """Sanitizes and JSON-encodes a capture record; runs on the listener thread."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        capture_record = dict(record.msg)
+        capture_record["request"] = sanitize(capture_record["request"])
+        return json.dumps(capture_record, separators=(",", ":"))
+
+
+class _RecordQueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Hand the raw record to the listener; encoding happens there
+        return record
+
+
+def _get_logger() -> logging.Logger:
+    """
+    A dedicated logger whose records go through a queue to a background thread
+    writing one JSON line each to rotating files, so request handlers (and the
+    event loop) never encode or touch the disk.
+    """
+    global _logger
+    with _logger_lock:
+        if _logger is None:
+            os.makedirs(CAPTURE_DIR, exist_ok=True)
+            file_handler = logging.handlers.RotatingFileHandler(
+                os.path.join(CAPTURE_DIR, f"{CAPTURE_FILENAME}.{os.getpid()}"),
+                maxBytes=CAPTURE_MAX_BYTES, backupCount=CAPTURE_BACKUP_COUNT, encoding="utf-8")
+            file_handler.setFormatter(_RecordFormatter())
+            records = queue.SimpleQueue()
+            listener = logging.handlers.QueueListener(records, file_handler)
+            listener.start()
+            atexit.register(listener.stop)
+            logger = logging.getLogger("valuation.capture")
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            logger.addHandler(_RecordQueueHandler(records))
+            _logger = logger
+    return _logger
+
+
+def should_capture() -> bool:
+    return bool(CAPTURE_DIR) and random.random() < CAPTURE_SAMPLE_RATE
+
+
+def sanitize(valuation_data: dict) -> dict:
+    """
+    Drops free-text building names, which may identify the customer; every
+    input the engine prices on (categories, sizes, materials, location) is kept.
+    """
+    buildings = [
+        {**building, "name": f"Building {i + 1}"}
+        for i, building in enumerate(valuation_data.get("buildings", []))
+    ]
+    return {**valuation_data, "buildings": buildings}
+
+
+def capture(valuation_data: dict, results: dict, elapsed: float, exact_money: bool = False):
+    """
+    Queues a request, its results and the handler time for writing to the
+    capture files. `elapsed` covers the whole valuation step of the handler,
+    including any micro-batching or threadpool wait, hence `handler_ms`.
+    """
+    record = {
+        "timestamp": time.time(),
+        "exact_money": exact_money,
+        "handler_ms": elapsed * 1000,
+        "request": valuation_data,
+        # Only the amounts: suggested grades and any breakdown carry building names
+        "results": {field: results[field] for field in MONEY_FIELDS},
+    }
+    _get_logger().info(record)
+
+
+def read_captures(paths: list) -> list:
+    """Loads capture records from files (rotated or not), ordered by timestamp."""
+    records = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            records.extend(json.loads(line) for line in f if line.strip())
+    records.sort(key=lambda record: record["timestamp"])
+    return records
@@ -1,25 +1,223 @@
 # api/main.py
 
-from fastapi import FastAPI
-from .models import ValuationRequest, ValuationResponse
-from core.calculation_engine import run_full_valuation
-
-app = FastAPI(
-    title="CBO Property Valuation API",
-    description="An API to perform property valuations based on the CBO manual.",
-    version="1.0.0"
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import List, Optional
+
+from fastapi import APIRouter, FastAPI, HTTPException, Query, Header, Request, Response
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+from .models import (
+    ValuationRequest, ValuationResponse, BranchMatch, ValuationState, ValuationWithState, ReestimateRequest,
+)
+from . import profiling, capture, state_signing
+from .batching import MicroBatcher
+from .warmup import warm_up
+from core.calculation_engine import (
+    run_full_valuation, run_batch_valuation, valuation_to_birr, building_cost_cache,
+    run_valuation_with_state, reestimate,
 )
+from core.branch_index import branch_index
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
 
-@app.get("/")
+@router.get("/")
 def read_root():
     return {"message": "Welcome to the Valuation API. Please use the /docs endpoint to see the API documentation."}
 
-@app.post("/estimate", response_model=ValuationResponse)
-def create_estimation(request: ValuationRequest):
+@router.post("/estimate", response_model=ValuationResponse, response_model_exclude_none=True)
+async def create_estimation(request: ValuationRequest, response: Response, http_request: Request,
+                            exact_money: bool = False, explain: bool = False,
+                            x_profile: Optional[str] = Header(None)):
     """
     Receives property and building data, performs a full valuation,
     and returns the estimated values.
+
+    With `?exact_money=true` the valuation is computed in integer cents and every
+    amount is rounded to the cent. `?explain=true` adds the full cost breakdown
+    for audit (not combinable with exact_money). Requests carrying the admin `X-Profile` token
+    (or picked by the sampling rate) are profiled; the stored summary is
+    available under `/admin/profiles/{X-Profile-Id}`. When capture is enabled a
+    sample of sanitized requests is written for replay (see benchmarks/replay.py).
+
+    Concurrent exact-money requests are micro-batched (api/batching.py) and
+    valued together by one vectorized `run_batch_valuation` call; batching adds
+    at most VALUATION_BATCH_MAX_WAIT_MS, waiting and batch execution included.
+    Float requests are not batched: one at a time they already reuse cached
+    building results and the vectorized float path is slower.
     """
+    if explain and exact_money:
+        raise HTTPException(status_code=400, detail="explain cannot be combined with exact_money")
     # The Pydantic model is automatically converted to a dictionary
-    valuation_results = run_full_valuation(request.dict())
+    valuation_data = request.dict()
+    started = time.perf_counter()
+    batcher = http_request.app.state.estimate_batcher
+    try:
+        if profiling.should_profile(x_profile):
+            valuation_results, profile_id = await run_in_threadpool(
+                profiling.run_profiled, run_full_valuation, valuation_data, exact_money=exact_money, explain=explain,
+                context={"endpoint": "/estimate", "num_buildings": len(request.buildings)})
+            if profile_id is not None:
+                response.headers["X-Profile-Id"] = profile_id
+        elif explain or not exact_money or not batcher.enabled:
+            valuation_results = await run_in_threadpool(run_full_valuation, valuation_data, exact_money=exact_money, explain=explain)
+        else:
+            valuation_results = await batcher.submit(valuation_data)
+    except ValueError as e:
+        # e.g. amounts too large to represent in exact-money mode
+        raise HTTPException(status_code=400, detail=str(e))
+    if capture.should_capture():
+        try:
+            capture.capture(valuation_data, valuation_results, time.perf_counter() - started, exact_money)
+        except Exception:
+            # Capture is best effort; never fail a valuation that succeeded
+            logger.exception("Could not capture /estimate request")
+    if exact_money:
+        return valuation_to_birr(valuation_results)
     return valuation_results
+
+@router.post("/estimate/state", response_model=ValuationWithState, response_model_exclude_none=True)
+def create_estimation_with_state(request: ValuationRequest):
+    """
+    Same valuation as `/estimate`, plus a signed reusable state (per-building
+    costs, building total and stage results) to send back to `/estimate/delta`.
+    """
+    results, state = run_valuation_with_state(request.dict())
+    return {"results": results, "state": _signed_state(state)}
+
+@router.post("/estimate/delta", response_model=ValuationWithState, response_model_exclude_none=True)
+async def create_delta_estimation(request: ReestimateRequest):
+    """
+    What-if edits: applies changed other-cost and property fields to a state
+    from `/estimate/state`, recomputing only the other costs, location value
+    and limit, and market/forced values. Buildings are not revalued. States
+    that were altered (or not issued by this service) are rejected.
+    """
+    state = request.state.dict(exclude={"signature"})
+    if not state_signing.verify_state(state, request.state.signature):
+        raise HTTPException(status_code=400, detail="Invalid state signature; request a new state from /estimate/state")
+    try:
+        results, new_state = reestimate(
+            state,
+            other_costs=request.other_costs.dict(exclude_none=True) if request.other_costs else None,
+            property_details=request.property_details.dict(exclude_none=True) if request.property_details else None)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"results": results, "state": _signed_state(new_state)}
+
+def _signed_state(state: dict) -> dict:
+    # Sign the model's canonical types, which is what /estimate/delta receives back
+    state = ValuationState(**state).dict(exclude={"signature"})
+    return {**state, "signature": state_signing.sign_state(state)}
+
+@router.get("/branches", response_model=List[BranchMatch])
+def search_branches(prefix: str = "", limit: int = Query(20, ge=1, le=500)):
+    """
+    Autocomplete for branch names: returns branches starting with `prefix`
+    (case-insensitive) together with their district.
+    """
+    return branch_index.search(prefix, limit)
+
+@router.get("/branches/{branch_name}", response_model=BranchMatch)
+def get_branch(branch_name: str):
+    """Returns the district a branch belongs to."""
+    match = branch_index.lookup(branch_name)
+    if match is None:
+        raise HTTPException(status_code=404, detail=f"Unknown branch: {branch_name}")
+    return match
+
+@router.get("/admin/profiles")
+def list_profiles(x_profile: Optional[str] = Header(None)):
+    """Lists the stored request profiles (requires the admin `X-Profile` token)."""
+    if not profiling.is_admin(x_profile):
+        raise HTTPException(status_code=403, detail="Admin token required")
+    return profiling.list_profiles()
+
+@router.get("/admin/profiles/{profile_id}")
+def get_profile(profile_id: str, x_profile: Optional[str] = Header(None)):
+    """Returns the hottest functions recorded for one profiled request."""
+    if not profiling.is_admin(x_profile):
+        raise HTTPException(status_code=403, detail="Admin token required")
+    profile = profiling.get_profile(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"Unknown profile: {profile_id}")
+    return profile
+
+@router.get("/admin/building-cache")
+def get_building_cache_stats(x_profile: Optional[str] = Header(None)):
+    """Hit/miss/eviction statistics of this worker's building cost cache (admin token required)."""
+    if not profiling.is_admin(x_profile):
+        raise HTTPException(status_code=403, detail="Admin token required")
+    return building_cost_cache.stats()
+
+@router.get("/admin/batching")
+def get_batching_stats(request: Request, x_profile: Optional[str] = Header(None)):
+    """Micro-batching settings and counters of this worker's exact-money batcher (admin token required)."""
+    if not profiling.is_admin(x_profile):
+        raise HTTPException(status_code=403, detail="Admin token required")
+    return request.app.state.estimate_batcher.stats()
+
+@router.get("/ready")
+def readiness(request: Request):
+    """Readiness probe: 503 until the warm-up of this worker has finished, or if it failed."""
+    if request.app.state.warm_up_error is not None:
+        return JSONResponse(status_code=503, content={"status": "failed", "error": request.app.state.warm_up_error})
+    if not request.app.state.ready.is_set():
+        return JSONResponse(status_code=503, content={"status": "warming up"})
+    return {"status": "ready", "warm_up_seconds": request.app.state.warm_up_seconds}
+
+def _run_warm_up(app: FastAPI):
+    app.state.warm_up_seconds = warm_up()
+    app.state.ready.set()
+
+def _run_warm_up_in_background(app: FastAPI):
+    try:
+        _run_warm_up(app)
+    except Exception as e:
+        # The worker keeps serving but never reports ready; /ready shows why
+        logger.exception("Warm-up failed")
+        app.state.warm_up_error = f"{type(e).__name__}: {e}"
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    # Preloaded apps were warmed before forking; others warm up in the background
+    if not app.state.ready.is_set():
+        threading.Thread(target=_run_warm_up_in_background, args=(app,), name="warm-up", daemon=True).start()
+    yield
+
+def create_app(preload: bool = False) -> FastAPI:
+    """
+    Builds the API application.
+
+    With `preload=True` the warm-up runs immediately, so a server that loads the
+    app before forking (gunicorn --preload, see gunicorn.conf.py) hands warm,
+    copy-on-write shared tables to every worker, which report ready at once.
+    A failing preload warm-up raises, so the server does not start.
+    """
+    app = FastAPI(
+        title="CBO Property Valuation API",
+        description="An API to perform property valuations based on the CBO manual.",
+        version="1.0.0",
+        lifespan=_lifespan,
+    )
+    app.state.ready = threading.Event()
+    app.state.warm_up_seconds = None
+    app.state.warm_up_error = None
+    app.state.estimate_batcher = MicroBatcher(partial(run_batch_valuation, exact_money=True))
+    app.include_router(router)
+    if preload:
+        _run_warm_up(app)
+    return app
+
+def __getattr__(name: str):
+    # `uvicorn api.main:app` builds the default app on first access, so
+    # importing this module for `create_app(preload=True)` does not build it
+    if name == "app":
+        globals()["app"] = create_app()
+        return globals()["app"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -37,6 +37,55 @@ class ValuationRequest(BaseModel):
     property_details: PropertyDetails
     other_costs: OtherCosts
 
+class DeductionLine(BaseModel):
+    component: str
+    fraction: float # share of the full replacement cost, 0.03 = 3%
+
+class ComponentLine(BaseModel):
+    component: str
+    quantity: float
+    rate: float
+    amount: float
+
+class BuildingBreakdown(BaseModel):
+    name: Optional[str] = None
+    category: str
+    building_cost: float
+
+    # Standard buildings
+    area: Optional[float] = None
+    num_floors: Optional[int] = None
+    building_type_for_rate: Optional[str] = None
+    suggested_grade: Optional[str] = None
+    applied_grade: Optional[str] = None
+    grade_source: Optional[str] = None # "confirmed" or "suggested"
+    rate: Optional[float] = None
+    full_replacement_cost: Optional[float] = None
+    is_under_construction: Optional[bool] = None
+    deductions: Optional[List[DeductionLine]] = None
+
+    # Specialized buildings
+    component_lines: Optional[List[ComponentLine]] = None
+
+class OtherCostLine(BaseModel):
+    item: str
+    percent: Optional[float] = None # whole percent of the building cost, 5 = 5%
+    amount: float
+
+class LocationBreakdown(BaseModel):
+    plot_area: float
+    rate_per_m2: float
+    calculated_value: float
+    limit: float
+    limit_rule: str
+    capped: bool
+    applied_value: float
+
+class ValuationBreakdown(BaseModel):
+    buildings: List[BuildingBreakdown]
+    other_costs: List[OtherCostLine]
+    location: LocationBreakdown
+
 class ValuationResponse(BaseModel):
     total_building_cost: float
     total_other_costs: float
@@ -46,3 +95,40 @@ class ValuationResponse(BaseModel):
     estimated_market_value: float
     estimated_forced_value: float
     suggested_grades: Dict[str, str]
+    breakdown: Optional[ValuationBreakdown] = None # only with ?explain=true
+
+class BranchMatch(BaseModel):
+    branch: str
+    district: str
+
+class OtherCostsUpdate(BaseModel):
+    fence_percent: Optional[int] = None
+    septic_percent: Optional[int] = None
+    external_works_percent: Optional[int] = None
+    consultancy_percent: Optional[int] = None
+    water_tank_cost: Optional[float] = None
+
+class PropertyDetailsUpdate(BaseModel):
+    plot_area: Optional[float] = None
+    prop_town: Optional[str] = None
+    gen_use: Optional[str] = None
+    plot_grade: Optional[str] = None
+
+class ValuationState(BaseModel):
+    building_costs: List[float]
+    suggested_grades: Dict[str, str]
+    ccw: float
+    other_costs: OtherCosts
+    property_details: PropertyDetails
+    total_other_costs: float
+    location: List[float] # calculated value, limit, applied value
+    signature: Optional[str] = None # set by /estimate/state, checked by /estimate/delta
+
+class ValuationWithState(BaseModel):
+    results: ValuationResponse
+    state: ValuationState
+
+class ReestimateRequest(BaseModel):
+    state: ValuationState
+    other_costs: Optional[OtherCostsUpdate] = None
+    property_details: Optional[PropertyDetailsUpdate] = None
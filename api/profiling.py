@@ -0,0 +1,130 @@
+# api/profiling.py
+
+import cProfile
+import json
+import os
+import pstats
+import random
+import secrets
+import threading
+import time
+from collections import deque
+
+# Profiling is off unless a token or a sampling rate is configured
+PROFILE_TOKEN = os.environ.get("VALUATION_PROFILE_TOKEN", "")
+PROFILE_SAMPLE_RATE = float(os.environ.get("VALUATION_PROFILE_SAMPLE_RATE", "0"))
+PROFILE_TOP_N = int(os.environ.get("VALUATION_PROFILE_TOP_N", "25"))
+PROFILE_KEEP = int(os.environ.get("VALUATION_PROFILE_KEEP", "100"))
+# Optional directory where summaries are also written, so any worker can serve
+# them; it is pruned to the newest PROFILE_KEEP files after each write
+PROFILE_DIR = os.environ.get("VALUATION_PROFILE_DIR", "")
+
+# Only one profiler can be active per process; requests arriving while it is
+# busy simply run unprofiled.
+_profiler_lock = threading.Lock()
+_profiles = deque(maxlen=PROFILE_KEEP)
+
+
+def should_profile(profile_header) -> bool:
+    """Cheap check done on every request: admin header match or sampling."""
+    if is_admin(profile_header):
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+def is_admin(token) -> bool:
+    # compare_digest only accepts ASCII str, and headers may carry any latin-1 text
+    return bool(PROFILE_TOKEN) and token is not None and secrets.compare_digest(
+        token.encode("utf-8"), PROFILE_TOKEN.encode("utf-8"))
+
+
+def summarize(profiler: cProfile.Profile, top_n: int = PROFILE_TOP_N) -> list:
+    """Returns the `top_n` functions by own time as plain dicts."""
+    stats = pstats.Stats(profiler)
+    rows = []
+    for (filename, line, name), (_, calls, own_time, cumulative_time, _) in stats.stats.items():
+        rows.append({
+            "function": f"{os.path.basename(filename)}:{line}({name})",
+            "calls": calls,
+            "own_time_ms": own_time * 1000,
+            "cumulative_time_ms": cumulative_time * 1000,
+        })
+    rows.sort(key=lambda row: row["own_time_ms"], reverse=True)
+    return rows[:top_n]
+
+
+def run_profiled(func, *args, context=None, **kwargs):
+    """
+    Runs `func` under cProfile and stores a summary of its hottest functions,
+    together with the optional `context` dict (e.g. number of buildings).
+
+    Returns `(result, profile_id)`; `profile_id` is None when another request
+    is already being profiled and `func` ran unprofiled.
+    """
+    if not _profiler_lock.acquire(blocking=False):
+        return func(*args, **kwargs), None
+    try:
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            profiler.disable()
+        elapsed = time.perf_counter() - started
+    finally:
+        _profiler_lock.release()
+
+    profile_id = secrets.token_hex(8)
+    profile = {
+        "id": profile_id,
+        "created_at": time.time(),
+        "function": getattr(func, "__name__", repr(func)),
+        "wall_time_ms": elapsed * 1000,
+        "context": context or {},
+        "hottest_functions": summarize(profiler),
+    }
+    _profiles.append(profile)
+    if PROFILE_DIR:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        with open(os.path.join(PROFILE_DIR, f"{profile_id}.json"), "w") as f:
+            json.dump(profile, f)
+        _prune_profile_dir()
+    return result, profile_id
+
+
+def _prune_profile_dir(keep: int = PROFILE_KEEP):
+    """Deletes all but the `keep` newest summaries; workers sharing the directory may race."""
+    entries = []
+    for entry in os.scandir(PROFILE_DIR):
+        if entry.name.endswith(".json"):
+            try:
+                entries.append((entry.stat().st_mtime, entry.path))
+            except FileNotFoundError:
+                pass
+    entries.sort(reverse=True)
+    for _, path in entries[keep:]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def get_profile(profile_id: str):
+    for profile in _profiles:
+        if profile["id"] == profile_id:
+            return profile
+    if PROFILE_DIR and profile_id.isalnum():
+        path = os.path.join(PROFILE_DIR, f"{profile_id}.json")
+        if os.path.exists(path):
+            with open(path) as f:
+                return json.load(f)
+    return None
+
+
+def list_profiles() -> list:
+    """Stored profiles, newest first, without their function tables."""
+    return [
+        {key: value for key, value in profile.items() if key != "hottest_functions"}
+        for profile in reversed(_profiles)
+    ]
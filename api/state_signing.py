@@ -0,0 +1,22 @@
+# api/state_signing.py
+
+import hashlib
+import hmac
+import json
+import os
+import secrets
+
+# Key for the states handed out by /estimate/state. Without it each process
+# draws its own, so set it when several processes or replicas must accept each
+# other's states; changing it invalidates outstanding states.
+STATE_SECRET = os.environ.get("VALUATION_STATE_SECRET", "").encode("utf-8") or secrets.token_bytes(32)
+
+
+def sign_state(state: dict) -> str:
+    """HMAC-SHA256 over the canonical JSON of `state` (which must not hold its signature)."""
+    payload = json.dumps(state, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hmac.new(STATE_SECRET, payload, hashlib.sha256).hexdigest()
+
+
+def verify_state(state: dict, signature) -> bool:
+    return signature is not None and hmac.compare_digest(sign_state(state).encode("utf-8"), signature.encode("utf-8"))
@@ -0,0 +1,83 @@
+# api/warmup.py
+
+import logging
+import time
+
+from .models import ValuationRequest, ValuationResponse
+from core.calculation_engine import (
+    run_full_valuation, run_batch_valuation, run_portfolio_valuation, valuation_to_birr,
+)
+from core.branch_index import branch_index
+from core.portfolio import Portfolio
+
+logger = logging.getLogger(__name__)
+
+VILLA_MATERIALS = {
+    "Foundation": "RC, Best workmanship", "Roofing": "Decra, RC, EGA & similar tiles",
+    "Metal Work": "Aluminum profile", "Floor": "Granite, Marble, ceramic, parquet, porcelain",
+    "Ceiling": "Gypsum, PVC, Parquet", "Sanitary": "Jacuzzi, Steam, Sauna",
+}
+FACTORY_MATERIALS = {
+    "Foundation": "RC, Stone Masonry", "Structure": "RC, (Average)", "Roofing": "CIS G32 on wood (Average)",
+    "Metal Work": "LTZ", "Floor": "Cement screed Average)",
+}
+
+
+def _standard(category: str, num_floors: int, materials: dict, under_construction: bool = False) -> dict:
+    return {
+        "name": f"{category} G+{num_floors}", "category": category,
+        "length": 20.0, "width": 12.5, "num_floors": num_floors,
+        "selected_materials": materials, "confirmed_grade": None,
+        "is_under_construction": under_construction,
+        "incomplete_components": ["Roofing", "Floor finish"] if under_construction else [],
+    }
+
+
+def representative_requests() -> list:
+    """One request per pricing path: every category, rate row, under construction and location band."""
+    buildings = [
+        _standard("Higher Villa", 0, VILLA_MATERIALS),
+        _standard("Higher Villa", 0, VILLA_MATERIALS, under_construction=True),
+        _standard("Multi-Story Building", 2, VILLA_MATERIALS),
+        _standard("Multi-Story Building", 4, VILLA_MATERIALS, under_construction=True),
+        _standard("Multi-Story Building", 9, {}),
+        _standard("MPH & Factory Building", 1, FACTORY_MATERIALS),
+        {"name": "Fuel Station", "category": "Fuel Station",
+         "specialized_components": {"site_preparation_area": 400.0, "forecourt_area": 250.0, "canopy_area": 120.0,
+                                    "num_pump_islands": 2, "num_ugt_30m3": 1, "num_ugt_50m3": 1}},
+        {"name": "Coffee Washing Site", "category": "Coffee Washing Site",
+         "specialized_components": {"cherry_hopper_area": 20.0, "fermentation_tanks_area": 60.0,
+                                    "washing_channels_length": 40.0, "coffee_drier_area": 300.0}},
+    ]
+    requests = []
+    for plot_area, town in ((500.0, "Finfinne"), (4000.0, "Major Cities"), (15000.0, "Other Towns")):
+        requests.append({
+            "buildings": buildings,
+            "property_details": {"plot_area": plot_area, "prop_town": town, "gen_use": "Residential", "plot_grade": "1st"},
+            "other_costs": {"fence_percent": 5, "septic_percent": 2, "external_works_percent": 2,
+                            "consultancy_percent": 3, "water_tank_cost": 15508.0},
+        })
+    return requests
+
+
+def warm_up(rounds: int = 3) -> float:
+    """
+    Runs the representative requests through validation, every engine entry
+    point and response serialization so first real requests hit warm code.
+    Returns the elapsed seconds.
+    """
+    started = time.perf_counter()
+    requests = representative_requests()
+    for _ in range(rounds):
+        for payload in requests:
+            valuation_data = ValuationRequest(**payload).dict()
+            ValuationResponse(**run_full_valuation(valuation_data))
+            ValuationResponse(**valuation_to_birr(run_full_valuation(valuation_data, exact_money=True)))
+        run_batch_valuation(requests, exact_money=True)
+        portfolio = Portfolio.from_requests(requests)
+        run_portfolio_valuation(portfolio)
+        run_portfolio_valuation(portfolio, exact_money=True)
+        branch_index.search("a")
+    elapsed = time.perf_counter() - started
+    logger.info("Warm-up finished in %.3fs", elapsed)
+    return elapsed
@@ -0,0 +1,122 @@
+# benchmarks/load_test.py
+#
+# Starts api.main:app under uvicorn and drives it with concurrent requests
+# built from synthetic payloads, reporting throughput and latency percentiles
+# for each endpoint and uvicorn worker count.
+#
+#   python -m benchmarks.load_test --workers 1 2 4 --concurrency 64 --requests 5000
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+from .synthetic import make_valuation_requests
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    if not sorted_values:
+        return float("nan")
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def start_server(workers: int, port: int) -> subprocess.Popen:
+    command = [sys.executable, "-m", "uvicorn", "api.main:app", "--host", "127.0.0.1",
+               "--port", str(port), "--workers", str(workers), "--log-level", "warning"]
+    return subprocess.Popen(command, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+async def wait_until_up(base_url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/ready")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not start within {timeout}s")
+
+
+async def drive(base_url: str, endpoint: str, payloads: list, concurrency: int, total: int) -> dict:
+    """Sends `total` POSTs with at most `concurrency` in flight and collects latencies."""
+    latencies, errors = [], 0
+    next_index = 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        async def worker():
+            nonlocal next_index, errors
+            while next_index < total:
+                payload = payloads[next_index % len(payloads)]
+                next_index += 1
+                start = time.perf_counter()
+                try:
+                    response = await client.post(endpoint, json=payload)
+                    ok = response.status_code == 200
+                except httpx.HTTPError:
+                    ok = False
+                if ok:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": total,
+        "errors": errors,
+        "elapsed_s": elapsed,
+        "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p90_ms": percentile(latencies, 0.90) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": (latencies[-1] if latencies else float("nan")) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test for the valuation API")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1], help="uvicorn worker counts to try")
+    parser.add_argument("--endpoint", action="append", help="endpoint path(s) to POST to (default: /estimate)")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000, help="requests per endpoint and worker count")
+    parser.add_argument("--warmup", type=int, default=100, help="requests sent before measuring")
+    parser.add_argument("--payloads", type=int, default=500, help="number of distinct synthetic payloads")
+    parser.add_argument("--max-buildings", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--url", help="drive an already running server instead of starting one")
+    args = parser.parse_args()
+
+    endpoints = args.endpoint or ["/estimate"]
+    payloads = make_valuation_requests(args.payloads, args.seed, args.max_buildings)
+
+    print(f"{'workers':>7} {'endpoint':<28} {'rps':>9} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8} {'errors':>6}")
+    for workers in ([None] if args.url else args.workers):
+        base_url = args.url or f"http://127.0.0.1:{args.port}"
+        server = None if args.url else start_server(workers, args.port)
+        try:
+            asyncio.run(wait_until_up(base_url))
+            for endpoint in endpoints:
+                asyncio.run(drive(base_url, endpoint, payloads, args.concurrency, args.warmup))
+                stats = asyncio.run(drive(base_url, endpoint, payloads, args.concurrency, args.requests))
+                print(f"{workers or '-':>7} {endpoint:<28} {stats['throughput_rps']:9.1f} {stats['p50_ms']:8.2f} "
+                      f"{stats['p90_ms']:8.2f} {stats['p99_ms']:8.2f} {stats['max_ms']:8.2f} {stats['errors']:6d}")
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait(timeout=30)
+
+
+if __name__ == "__main__":
+    main()
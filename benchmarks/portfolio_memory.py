@@ -0,0 +1,57 @@
+# benchmarks/portfolio_memory.py
+#
+# Measures memory per building and valuation time for the nested-dict
+# representation versus core.portfolio.Portfolio.
+#
+#   python -m benchmarks.portfolio_memory --properties 100000
+
+import argparse
+import time
+import tracemalloc
+
+from core.calculation_engine import run_batch_valuation, run_portfolio_valuation
+from core.portfolio import Portfolio
+from .synthetic import make_valuation_requests
+
+
+def measure(build):
+    """Returns `build()` and the bytes it still holds once `build` returns."""
+    tracemalloc.start()
+    value = build()
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, allocated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Portfolio memory and valuation benchmark")
+    parser.add_argument("--properties", type=int, default=20000)
+    parser.add_argument("--max-buildings", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    requests, dict_bytes = measure(lambda: make_valuation_requests(args.properties, args.seed, args.max_buildings))
+    num_buildings = sum(len(r["buildings"]) for r in requests)
+    # Build from a fresh copy of the requests inside the traced region so the
+    # names and material strings the portfolio keeps are counted, while the
+    # source dicts are freed before the measurement is taken
+    portfolio, portfolio_bytes = measure(
+        lambda: Portfolio.from_requests(make_valuation_requests(args.properties, args.seed, args.max_buildings)))
+
+    print(f"properties: {args.properties}, buildings: {num_buildings}")
+    print(f"nested dicts: {dict_bytes / num_buildings:10.1f} bytes/building (tracemalloc)")
+    print(f"portfolio:    {portfolio_bytes / num_buildings:10.1f} bytes/building (tracemalloc)")
+    print(f"portfolio:    {portfolio.memory_usage()['per_building']:10.1f} bytes/building (memory_usage)")
+
+    for label, run in (
+        ("run_batch_valuation (exact)", lambda: run_batch_valuation(requests, exact_money=True)),
+        ("run_portfolio_valuation (exact)", lambda: run_portfolio_valuation(portfolio, exact_money=True)),
+        ("run_portfolio_valuation (float)", lambda: run_portfolio_valuation(portfolio)),
+    ):
+        start = time.perf_counter()
+        run()
+        print(f"{label:34s} {time.perf_counter() - start:8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+# benchmarks/replay.py
+#
+# Replays requests captured by api/capture.py (VALUATION_CAPTURE_DIR).
+#
+# Compare two engine versions (each a checkout of this repo) on captured traffic:
+#   python -m benchmarks.replay engine --baseline ../valuation-main --candidate . captures/*
+#
+# Replay against a running API at recorded pace (--speed 1), 10x faster, or
+# unpaced (--speed 0), comparing responses with the recorded results:
+#   python -m benchmarks.replay api --url http://127.0.0.1:8000 --speed 10 captures/*
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+from api.capture import read_captures
+from core.calculation_engine import MONEY_FIELDS
+from .load_test import percentile
+
+# Runs inside a subprocess with only the target checkout's `core` importable,
+# so two engine versions never share a process.
+ENGINE_WORKER = """
+import json, sys, time
+sys.path.insert(0, sys.argv[1])
+from core.calculation_engine import run_full_valuation
+for line in sys.stdin:
+    record = json.loads(line)
+    started = time.perf_counter()
+    try:
+        if record.get("exact_money"):
+            results = run_full_valuation(record["request"], exact_money=True)
+        else:
+            results = run_full_valuation(record["request"])
+    except Exception as e:  # e.g. an older engine without exact_money
+        print(json.dumps({"error": f"{type(e).__name__}: {e}"}))
+        continue
+    elapsed = time.perf_counter() - started
+    results.pop("suggested_grades", None)
+    print(json.dumps({"engine_ms": elapsed * 1000, "results": results}))
+"""
+
+
+def run_engine(root: str, records: list) -> list:
+    stdin = "".join(json.dumps(record) + "\n" for record in records)
+    completed = subprocess.run([sys.executable, "-c", ENGINE_WORKER, os.path.abspath(root)],
+                               input=stdin, capture_output=True, text=True, check=True)
+    return [json.loads(line) for line in completed.stdout.splitlines() if line.strip()]
+
+
+def compare_results(expected: list, actual: list, tolerance: float) -> list:
+    """Returns (index, field, expected, actual) for every money field differing by more than `tolerance`."""
+    mismatches = []
+    for index, (left, right) in enumerate(zip(expected, actual)):
+        if left is None or right is None:
+            continue
+        for field in MONEY_FIELDS:
+            if field not in left:
+                continue
+            if right.get(field) is None or abs(left[field] - right[field]) > tolerance:
+                mismatches.append((index, field, left[field], right.get(field)))
+    return mismatches
+
+
+def latency_summary(latencies_ms: list) -> str:
+    values = sorted(latencies_ms)
+    return (f"n={len(values)} p50={percentile(values, 0.5):.3f}ms p90={percentile(values, 0.9):.3f}ms "
+            f"p99={percentile(values, 0.99):.3f}ms max={values[-1] if values else float('nan'):.3f}ms")
+
+
+def report_mismatches(mismatches: list, limit: int = 10):
+    print(f"output mismatches: {len(mismatches)}")
+    for index, field, expected, actual in mismatches[:limit]:
+        print(f"  record {index}: {field} {expected} -> {actual}")
+
+
+def replay_engine(args, records: list):
+    baseline = run_engine(args.baseline, records)
+    candidate = run_engine(args.candidate, records)
+    for label, root, runs in (("baseline ", args.baseline, baseline), ("candidate", args.candidate, candidate)):
+        errors = [r["error"] for r in runs if "error" in r]
+        print(f"{label} ({root}): {latency_summary([r['engine_ms'] for r in runs if 'error' not in r])}, errors: {len(errors)}")
+        if errors:
+            print(f"  first error: {errors[0]}")
+    report_mismatches(compare_results([r.get("results") for r in baseline], [r.get("results") for r in candidate], args.tolerance))
+
+
+async def replay_api(args, records: list) -> tuple:
+    latencies = [None] * len(records)
+    responses = [None] * len(records)
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async with httpx.AsyncClient(base_url=args.url, timeout=60.0) as client:
+        async def send(index: int, record: dict):
+            async with semaphore:
+                params = {"exact_money": "true"} if record.get("exact_money") else None
+                started = time.perf_counter()
+                response = await client.post("/estimate", json=record["request"], params=params)
+                latencies[index] = (time.perf_counter() - started) * 1000
+                if response.status_code == 200:
+                    responses[index] = response.json()
+
+        tasks = []
+        replay_start = time.monotonic()
+        first_timestamp = records[0]["timestamp"] if records else 0
+        for index, record in enumerate(records):
+            if args.speed > 0:
+                delay = (record["timestamp"] - first_timestamp) / args.speed - (time.monotonic() - replay_start)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(send(index, record)))
+        await asyncio.gather(*tasks)
+    return latencies, responses
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay captured /estimate traffic")
+    subparsers = parser.add_subparsers(dest="mode", required=True)
+
+    engine_parser = subparsers.add_parser("engine", help="compare two engine checkouts in-process")
+    engine_parser.add_argument("--baseline", required=True, help="root of the baseline checkout")
+    engine_parser.add_argument("--candidate", default=".", help="root of the candidate checkout")
+
+    api_parser = subparsers.add_parser("api", help="replay against a running API")
+    api_parser.add_argument("--url", required=True)
+    api_parser.add_argument("--speed", type=float, default=1.0, help="pace multiplier, 0 = no delays")
+    api_parser.add_argument("--concurrency", type=int, default=64)
+
+    for sub in (engine_parser, api_parser):
+        sub.add_argument("captures", nargs="+", help="capture files")
+        sub.add_argument("--tolerance", type=float, default=0.0, help="allowed absolute difference per amount")
+        sub.add_argument("--limit", type=int, help="replay at most this many records")
+    args = parser.parse_args()
+
+    records = read_captures(args.captures)[:args.limit]
+    print(f"records: {len(records)}")
+    if args.mode == "engine":
+        replay_engine(args, records)
+        return
+
+    latencies, responses = asyncio.run(replay_api(args, records))
+    # Older captures called the same measurement engine_ms
+    recorded = [r.get("handler_ms", r.get("engine_ms")) for r in records]
+    print(f"recorded handler time (engine + batching/threadpool wait): {latency_summary(recorded)}")
+    print(f"replayed request time: {latency_summary([l for l in latencies if l is not None])}")
+    print(f"failed requests: {sum(r is None for r in responses)}")
+    # Exact-money captures hold cents while the API answers in Birr
+    expected = [
+        {k: v / 100 for k, v in r["results"].items()} if r.get("exact_money") else r["results"]
+        for r in records
+    ]
+    report_mismatches(compare_results(expected, responses, args.tolerance))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# benchmarks/synthetic.py
+
+import random
+
+from core.calculation_engine import STANDARD_CATEGORIES, FUEL_STATION_COMPONENT_RATES, COFFEE_SITE_COMPONENT_RATES
+from core.data_loader import get_materials_by_category, get_component_percentages
+
+CATEGORY_WEIGHTS = {
+    "Higher Villa": 0.35,
+    "Multi-Story Building": 0.40,
+    "MPH & Factory Building": 0.15,
+    "Fuel Station": 0.06,
+    "Coffee Washing Site": 0.04,
+}
+TOWNS = ["Finfinne", "Major Cities", "Other Towns"]
+INCOMPLETE_COMPONENTS = list(get_component_percentages().index)
+
+
+def make_building(rng: random.Random, index: int) -> dict:
+    """Returns one `Building`-shaped dict with a realistic mix of inputs."""
+    category = rng.choices(list(CATEGORY_WEIGHTS), weights=list(CATEGORY_WEIGHTS.values()))[0]
+    building = {"name": f"Building {index}", "category": category}
+    if category in STANDARD_CATEGORIES:
+        is_under_construction = rng.random() < 0.15
+        building.update({
+            "length": round(rng.uniform(8, 40), 2),
+            "width": round(rng.uniform(6, 25), 2),
+            "num_floors": 0 if category == "Higher Villa" else rng.randint(1, 8),
+            "selected_materials": {
+                component: rng.choice(options)
+                for component, options in get_materials_by_category(category).items()
+            },
+            "confirmed_grade": rng.choice([None, None, "Good", "Average"]),
+            "is_under_construction": is_under_construction,
+            "incomplete_components": rng.sample(INCOMPLETE_COMPONENTS, rng.randint(1, 4)) if is_under_construction else [],
+        })
+    else:
+        rates = FUEL_STATION_COMPONENT_RATES if category == "Fuel Station" else COFFEE_SITE_COMPONENT_RATES
+        building["specialized_components"] = {
+            component: float(rng.randint(1, 4)) if component.startswith("num_") else round(rng.uniform(20, 400), 2)
+            for component in rates
+        }
+    return building
+
+
+def make_valuation_request(rng: random.Random, max_buildings: int = 4) -> dict:
+    """Returns one `ValuationRequest`-shaped dict."""
+    return {
+        "buildings": [make_building(rng, i + 1) for i in range(rng.randint(1, max_buildings))],
+        "property_details": {
+            "plot_area": round(rng.uniform(150, 12000), 2),
+            "prop_town": rng.choice(TOWNS),
+            "gen_use": "Residential",
+            "plot_grade": rng.choice(["1st", "2nd", "3rd", "4th"]),
+        },
+        "other_costs": {
+            "fence_percent": rng.randint(0, 10),
+            "septic_percent": rng.randint(0, 3),
+            "external_works_percent": rng.randint(0, 3),
+            "consultancy_percent": rng.randint(0, 3),
+            "water_tank_cost": 15508.0,
+        },
+    }
+
+
+def make_valuation_requests(count: int, seed: int = 0, max_buildings: int = 4) -> list:
+    rng = random.Random(seed)
+    return [make_valuation_request(rng, max_buildings) for _ in range(count)]
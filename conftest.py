@@ -0,0 +1,5 @@
+# conftest.py
+#
+# Lets pytest import the `core` and `api` packages when run from the repo root:
+#
+#   python -m pytest -q
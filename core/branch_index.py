@@ -0,0 +1,97 @@
+# core/branch_index.py
+
+from .data_loader import get_branches_data
+
+
+def normalize_name(name: str) -> str:
+    """Normalizes a branch or district name for lookups: trimmed, single-spaced, case-folded."""
+    return " ".join(name.split()).casefold()
+
+
+class _TrieNode:
+    __slots__ = ("children", "branch", "ordered")
+
+    def __init__(self):
+        self.children = {}
+        self.branch = None  # normalized branch key when a branch name ends here
+        self.ordered = ()  # children in reverse alphabetical order, filled by _compile
+
+
+class BranchIndex:
+    """
+    Precompiled branch -> district index built from `get_branches_data`.
+
+    District names are stripped of stray whitespace, branch lookups are
+    case-insensitive and O(1), and a character trie serves prefix searches
+    for autocomplete. If a branch name appears in two districts the first
+    one wins.
+    """
+
+    def __init__(self, branches_data: dict):
+        self._entries = {}  # normalized branch -> (branch name, district name)
+        self._districts = {}  # district name -> tuple of branch names
+        self._root = _TrieNode()
+        for district, branches in branches_data.items():
+            district_name = " ".join(district.split())
+            self._districts[district_name] = tuple(" ".join(b.split()) for b in branches)
+            for branch in self._districts[district_name]:
+                key = normalize_name(branch)
+                if key in self._entries:
+                    continue
+                self._entries[key] = (branch, district_name)
+                self._insert(key)
+        self._compile()
+
+    def _insert(self, key: str):
+        node = self._root
+        for char in key:
+            node = node.children.setdefault(char, _TrieNode())
+        node.branch = key
+
+    def _compile(self):
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            node.ordered = tuple(node.children[char] for char in sorted(node.children, reverse=True))
+            stack.extend(node.children.values())
+
+    def districts(self) -> list:
+        return list(self._districts)
+
+    def branches_in(self, district: str) -> tuple:
+        return self._districts.get(" ".join(district.split()), ())
+
+    def lookup(self, branch: str):
+        """Returns {"branch", "district"} with the canonical branch name, or None when unknown."""
+        entry = self._entries.get(normalize_name(branch))
+        return {"branch": entry[0], "district": entry[1]} if entry else None
+
+    def district_of(self, branch: str):
+        """Returns the district of a branch, or None when the branch is unknown."""
+        entry = self._entries.get(normalize_name(branch))
+        return entry[1] if entry else None
+
+    def search(self, prefix: str = "", limit: int = 20) -> list:
+        """Returns up to `limit` {"branch", "district"} dicts whose branch starts with `prefix`, alphabetically."""
+        node = self._root
+        for char in normalize_name(prefix):
+            node = node.children.get(char)
+            if node is None:
+                return []
+        results = []
+        stack = [node]
+        while stack and len(results) < limit:
+            current = stack.pop()
+            if current.branch is not None:
+                branch, district = self._entries[current.branch]
+                results.append({"branch": branch, "district": district})
+            # Children are stored in reverse order so the smallest is popped first
+            stack.extend(current.ordered)
+        return results
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Built once at import time so forked workers share it
+branch_index = BranchIndex(get_branches_data())
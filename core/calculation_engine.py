@@ -1,9 +1,19 @@
 # core/calculation_engine.py
 
+import hashlib
+import math
+import os
+
+import numpy as np
+
+from .building_cache import BuildingCostCache
 from .data_loader import (
     get_building_rates_data, get_component_percentages, 
     get_mapping_by_category, get_fuel_station_rates, get_coffee_site_rates
 )
+from .money import (
+    to_cents, from_cents, div_round, to_cents_array, div_round_array, max_abs, exact_int_arrays, group_sum_exact,
+)
 
 # Load data at the module level
 building_rates_data = get_building_rates_data()
@@ -11,27 +21,68 @@ component_percentages = get_component_percentages()
 fuel_station_rates = get_fuel_station_rates()
 coffee_site_rates = get_coffee_site_rates()
 
+STANDARD_CATEGORIES = ["Higher Villa", "Multi-Story Building", "MPH & Factory Building"]
+
+# Input quantity -> rate key for the specialized building types
+FUEL_STATION_COMPONENT_RATES = {
+    "site_preparation_area": "site_preparation",
+    "forecourt_area": "reinforced_concrete_forecourt",
+    "canopy_area": "steel_canopy",
+    "num_pump_islands": "pump_island",
+    "num_ugt_30m3": "ugt_30m3",
+    "num_ugt_50m3": "ugt_50m3",
+}
+COFFEE_SITE_COMPONENT_RATES = {
+    "cherry_hopper_area": "cherry_hopper",
+    "fermentation_tanks_area": "fermentation_tanks",
+    "washing_channels_length": "washing_channels",
+    "coffee_drier_area": "coffee_drier",
+}
+
+# Identifies the rate tables above; part of every building cache key
+RATE_VERSION = hashlib.sha1(repr((
+    building_rates_data, component_percentages.to_dict(), fuel_station_rates, coffee_site_rates,
+)).encode()).hexdigest()[:12]
+
+# Per-building results shared by all threads of the process (0 disables it)
+building_cost_cache = BuildingCostCache(maxsize=int(os.environ.get("VALUATION_BUILDING_CACHE_SIZE", "4096")))
+
+# Result keys holding amounts of money (int cents in exact-money mode)
+MONEY_FIELDS = (
+    "total_building_cost", "total_other_costs", "calculated_location_value",
+    "location_value_limit", "final_applied_location_value",
+    "estimated_market_value", "estimated_forced_value",
+)
+
 # --- NEW: Specialized Calculation Functions ---
 def calculate_fuel_station_value(components: dict) -> float:
     """Calculates value based on Fuel Station components."""
     total_value = 0
-    total_value += components.get("site_preparation_area", 0) * fuel_station_rates["site_preparation"]
-    total_value += components.get("forecourt_area", 0) * fuel_station_rates["reinforced_concrete_forecourt"]
-    total_value += components.get("canopy_area", 0) * fuel_station_rates["steel_canopy"]
-    total_value += components.get("num_pump_islands", 0) * fuel_station_rates["pump_island"]
-    total_value += components.get("num_ugt_30m3", 0) * fuel_station_rates["ugt_30m3"]
-    total_value += components.get("num_ugt_50m3", 0) * fuel_station_rates["ugt_50m3"]
+    for component, rate_key in FUEL_STATION_COMPONENT_RATES.items():
+        total_value += components.get(component, 0) * fuel_station_rates[rate_key]
     return total_value
 
 def calculate_coffee_site_value(components: dict) -> float:
     """Calculates value based on Coffee Washing Site components."""
     total_value = 0
-    total_value += components.get("cherry_hopper_area", 0) * coffee_site_rates["cherry_hopper"]
-    total_value += components.get("fermentation_tanks_area", 0) * coffee_site_rates["fermentation_tanks"]
-    total_value += components.get("washing_channels_length", 0) * coffee_site_rates["washing_channels"]
-    total_value += components.get("coffee_drier_area", 0) * coffee_site_rates["coffee_drier"]
+    for component, rate_key in COFFEE_SITE_COMPONENT_RATES.items():
+        total_value += components.get(component, 0) * coffee_site_rates[rate_key]
     return total_value
 
+def calculate_specialized_value_cents(category: str, components: dict) -> int:
+    """Exact-money counterpart of the specialized calculations, in integer cents."""
+    if category == "Fuel Station":
+        component_rates, rates = FUEL_STATION_COMPONENT_RATES, fuel_station_rates
+    elif category == "Coffee Washing Site":
+        component_rates, rates = COFFEE_SITE_COMPONENT_RATES, coffee_site_rates
+    else:
+        return 0
+    total_cents = 0
+    for component, rate_key in component_rates.items():
+        # quantity in hundredths * rate in cents / 100
+        total_cents += div_round(to_cents(components.get(component, 0)) * to_cents(rates[rate_key]), 100)
+    return total_cents
+
 # --- Existing Helper Functions (some are collapsed for brevity) ---
 def get_building_grade_rate(building_type: str, grade: str) -> float:
     # ... (function is unchanged)
@@ -44,6 +95,24 @@ def get_building_grade_rate(building_type: str, grade: str) -> float:
                 return (item['Average_Min'] + item['Average_Max']) / 2
     return 0
 
+def get_building_grade_rate_cents(building_type: str, grade: str) -> int:
+    """Exact-money counterpart of `get_building_grade_rate`: the averaged rate in cents."""
+    for item in building_rates_data:
+        if item['Building Type'] == building_type:
+            try:
+                return (item[f'{grade}_Min'] + item[f'{grade}_Max']) * 50
+            except KeyError:
+                return (item['Average_Min'] + item['Average_Max']) * 50
+    return 0
+
+def get_building_type_for_rate(category: str, num_floors: int) -> str:
+    """Maps a standard building category and floor count to its rate table row."""
+    if category == "Higher Villa":
+        return "Single Story Building (higher Villa)"
+    if 1 <= num_floors <= 2: return "G+1 and G+2"
+    elif 3 <= num_floors <= 4: return "G+3 and G+4"
+    else: return "G+7 and Above"
+
 def suggest_grade_from_materials(selected_materials: dict, category: str) -> str:
     # ... (function is unchanged)
     quality_scores = {'Excellent': 4, 'Good': 3, 'Average': 2, 'Economy': 1, 'Minimum': 0}
@@ -65,15 +134,18 @@ def suggest_grade_from_materials(selected_materials: dict, category: str) -> str
     if avg_score >= 0.5: return "Economy"
     return "Minimum"
 
-def calculate_under_construction_value(full_value: float, building_type: str, grade: str, incomplete_components: list) -> float:
-    # ... (function is unchanged)
-    total_deduction_percent = 0
+def _component_column_key(building_type: str, grade: str) -> str:
     grade_map = {'Excellent': 'Best', 'Good': 'Best', 'Average': 'Avg', 'Economy': 'Poor', 'Minimum': 'Poor'}
     if "Single Story" in building_type: type_key = "Single_Storey"
     elif "G+1" in building_type or "G+2" in building_type: type_key = "G1_G2"
     elif "G+3" in building_type or "G+4" in building_type: type_key = "G3_G4"
     else: type_key = "G1_G2"
-    column_key = f"{type_key}_{grade_map.get(grade, 'Avg')}"
+    return f"{type_key}_{grade_map.get(grade, 'Avg')}"
+
+def calculate_under_construction_value(full_value: float, building_type: str, grade: str, incomplete_components: list) -> float:
+    # ... (function is unchanged)
+    total_deduction_percent = 0
+    column_key = _component_column_key(building_type, grade)
     for component in incomplete_components:
         if component in component_percentages.index:
             try:
@@ -83,12 +155,26 @@ def calculate_under_construction_value(full_value: float, building_type: str, gr
     completed_percent = 1.0 - total_deduction_percent
     return full_value * completed_percent
 
-def calculate_location_value(town_category: str, use_type: str, plot_grade: str, plot_area: float) -> float:
-    # ... (function is unchanged)
+def get_completed_hundredths(building_type: str, grade: str, incomplete_components: list) -> int:
+    """Exact-money counterpart of the deduction: completed share in hundredths (100 = complete)."""
+    deduction_hundredths = 0
+    column_key = _component_column_key(building_type, grade)
+    for component in incomplete_components:
+        if component in component_percentages.index:
+            try:
+                deduction_hundredths += to_cents(component_percentages.loc[component, column_key])
+            except KeyError: pass
+    return 100 - deduction_hundredths
+
+def get_location_rate_per_m2(town_category: str) -> int:
     mock_rate_per_m2 = 3000 
     if "Finfinne" in town_category: mock_rate_per_m2 = 15000
     elif "Major Cities" in town_category: mock_rate_per_m2 = 8000
-    return mock_rate_per_m2 * plot_area
+    return mock_rate_per_m2
+
+def calculate_location_value(town_category: str, use_type: str, plot_grade: str, plot_area: float) -> float:
+    # ... (function is unchanged)
+    return get_location_rate_per_m2(town_category) * plot_area
 
 def calculate_location_value_limit(ccw: float, plot_area: float) -> float:
     # ... (function is unchanged)
@@ -100,68 +186,214 @@ def calculate_location_value_limit(ccw: float, plot_area: float) -> float:
     else:
         return 1.0 * ccw
 
-# --- Main Valuation Function (Revised) ---
-def run_full_valuation(valuation_data: dict) -> dict:
+# --- Breakdown Helpers (only called when a breakdown is requested) ---
+def explain_deductions(building_type: str, grade: str, incomplete_components: list) -> list:
     """
-    The main valuation function. Now handles both standard and specialized buildings.
+    Per-component deduction lines behind `calculate_under_construction_value`.
+    `fraction` is the share of the full replacement cost (0.03 is 3%), unlike
+    the whole-number `percent` of the other-cost lines.
     """
-    total_building_cost = 0
-    all_suggested_grades = {}
-    
-    for i, building in enumerate(valuation_data.get('buildings', [])):
-        category = building.get('category', 'Multi-Story Building')
-        building_cost = 0
-
-        if category in ["Higher Villa", "Multi-Story Building", "MPH & Factory Building"]:
-            area = building.get('length', 0) * building.get('width', 0)
-            num_floors = building.get('num_floors', 0)
-            
-            if category == "Higher Villa":
-                building_type_for_rate = "Single Story Building (higher Villa)"
-            else:
-                if 1 <= num_floors <= 2: building_type_for_rate = "G+1 and G+2"
-                elif 3 <= num_floors <= 4: building_type_for_rate = "G+3 and G+4"
-                else: building_type_for_rate = "G+7 and Above"
-            
-            suggested_grade = suggest_grade_from_materials(building.get('selected_materials', {}), category)
-            all_suggested_grades[f"Building {i+1} ({building.get('name')})"] = suggested_grade
-            grade = building.get('confirmed_grade') or suggested_grade
-            
-            rate = get_building_grade_rate(building_type_for_rate, grade)
-            full_replacement_cost = area * (num_floors + 1) * rate
-            
-            if building.get('is_under_construction', False):
-                building_cost = calculate_under_construction_value(full_replacement_cost, building_type_for_rate, grade, building.get('incomplete_components', []))
-            else:
-                building_cost = full_replacement_cost
+    lines = []
+    column_key = _component_column_key(building_type, grade)
+    for component in incomplete_components:
+        if component in component_percentages.index:
+            try:
+                lines.append({"component": component, "fraction": float(component_percentages.loc[component, column_key])})
+            except KeyError: pass
+    return lines
+
+def explain_specialized_components(category: str, components: dict) -> list:
+    """Quantity x rate lines behind the specialized calculations."""
+    if category == "Fuel Station":
+        component_rates, rates = FUEL_STATION_COMPONENT_RATES, fuel_station_rates
+    else:
+        component_rates, rates = COFFEE_SITE_COMPONENT_RATES, coffee_site_rates
+    return [
+        {"component": component, "quantity": float(components.get(component, 0)), "rate": float(rates[rate_key]),
+         "amount": float(components.get(component, 0) * rates[rate_key])}
+        for component, rate_key in component_rates.items()
+    ]
+
+def explain_location_value_limit(ccw: float, plot_area: float) -> str:
+    """Names the band of `calculate_location_value_limit` that applied."""
+    if ccw == 0: return "no building cost: limit is 0"
+    if plot_area <= 2000: return "plot area <= 2000 m2: 3.0 x building cost"
+    elif 2001 <= plot_area <= 10000: return "plot area 2001-10000 m2: 3.5 x building cost - building cost x plot area / 4000"
+    else: return "other plot areas: 1.0 x building cost"
+
+# --- Per-Building Valuation ---
+def value_building(building: dict, explain: bool = False) -> tuple:
+    """
+    Values one building. Returns `(building_cost, suggested_grade, breakdown_line)`;
+    the grade is None for specialized buildings and the line None unless `explain`.
+    """
+    category = building.get('category', 'Multi-Story Building')
+    building_cost = 0
+    suggested_grade = None
+    line = None
+
+    if category in STANDARD_CATEGORIES:
+        area = building.get('length', 0) * building.get('width', 0)
+        num_floors = building.get('num_floors', 0)
+        building_type_for_rate = get_building_type_for_rate(category, num_floors)
+        
+        suggested_grade = suggest_grade_from_materials(building.get('selected_materials', {}), category)
+        grade = building.get('confirmed_grade') or suggested_grade
         
-        elif category == "Fuel Station":
-            building_cost = calculate_fuel_station_value(building.get('specialized_components', {}))
+        rate = get_building_grade_rate(building_type_for_rate, grade)
+        full_replacement_cost = area * (num_floors + 1) * rate
         
-        elif category == "Coffee Washing Site":
-            building_cost = calculate_coffee_site_value(building.get('specialized_components', {}))
+        if building.get('is_under_construction', False):
+            building_cost = calculate_under_construction_value(full_replacement_cost, building_type_for_rate, grade, building.get('incomplete_components', []))
+        else:
+            building_cost = full_replacement_cost
+
+        if explain:
+            is_under_construction = bool(building.get('is_under_construction', False))
+            line = {
+                "name": building.get('name'), "category": category,
+                "area": float(area), "num_floors": num_floors, "building_type_for_rate": building_type_for_rate,
+                "suggested_grade": suggested_grade, "applied_grade": grade,
+                "grade_source": "confirmed" if building.get('confirmed_grade') else "suggested",
+                "rate": float(rate), "full_replacement_cost": float(full_replacement_cost),
+                "is_under_construction": is_under_construction,
+                "deductions": explain_deductions(building_type_for_rate, grade, building.get('incomplete_components', []))
+                              if is_under_construction else [],
+                "building_cost": float(building_cost),
+            }
+    
+    elif category == "Fuel Station":
+        building_cost = calculate_fuel_station_value(building.get('specialized_components', {}))
+    
+    elif category == "Coffee Washing Site":
+        building_cost = calculate_coffee_site_value(building.get('specialized_components', {}))
+
+    if explain and category not in STANDARD_CATEGORIES:
+        line = {
+            "name": building.get('name'), "category": category,
+            "component_lines": explain_specialized_components(category, building.get('specialized_components') or {})
+                               if category in ("Fuel Station", "Coffee Washing Site") else [],
+            "building_cost": float(building_cost),
+        }
+    return building_cost, suggested_grade, line
+
+def building_spec_key(building: dict, mode: str):
+    """
+    Canonical, hashable spec of everything a building's valuation depends on
+    (the name is excluded), prefixed with the engine mode and `RATE_VERSION`.
+    Returns None when the spec cannot be hashed, which bypasses the cache.
+    """
+    materials = building.get('selected_materials')
+    specialized = building.get('specialized_components')
+    key = (
+        mode, RATE_VERSION,
+        building.get('category', 'Multi-Story Building'),
+        building.get('length'), building.get('width'), building.get('num_floors'),
+        # Grade suggestion does not depend on material order
+        None if materials is None else tuple(sorted(materials.items())),
+        building.get('confirmed_grade'),
+        bool(building.get('is_under_construction', False)),
+        # Deductions are summed (and explained) in input order, so keep it
+        tuple(building.get('incomplete_components') or ()) if building.get('is_under_construction', False) else (),
+        # Specialized component lines follow rate-table order, not input order
+        None if specialized is None else tuple(sorted(specialized.items())),
+    )
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+# --- Main Valuation Function (Revised) ---
+def run_full_valuation(valuation_data: dict, exact_money: bool = False, explain: bool = False) -> dict:
+    """
+    The main valuation function. Now handles both standard and specialized buildings.
 
-        total_building_cost += building_cost
+    With `exact_money=True` every amount is returned as integer cents computed with
+    integer arithmetic (see `run_batch_valuation`).
 
-    ccw = total_building_cost
+    With `explain=True` the result also carries a `breakdown` with every
+    intermediate value (per-building area, rate, grade, deductions and component
+    lines, each other-cost line and the location-value cap decision). The
+    breakdown is only built when asked for, holds plain Python types (safe to
+    JSON-encode) and is not available in exact-money mode.
+    """
+    if exact_money:
+        if explain:
+            raise ValueError("explain is not supported together with exact_money")
+        return run_batch_valuation([valuation_data], exact_money=True)[0]
+
+    building_costs, all_suggested_grades, building_lines = value_buildings(valuation_data.get('buildings', []), explain)
+    ccw = sum(building_costs)
     
     # ... (rest of the function remains the same) ...
     other_costs_details = valuation_data.get('other_costs', {})
+    other_cost_lines = calculate_other_cost_lines(ccw, other_costs_details)
+    total_other_costs = sum(other_cost_lines)
+
+    property_details = valuation_data.get('property_details', {})
+    calculated_lv, lv_limit, final_location_value = calculate_location_stage(ccw, property_details)
+
+    results = combine_valuation_stages(ccw, total_other_costs, final_location_value, calculated_lv, lv_limit, all_suggested_grades)
+    if explain:
+        fence_cost, septic_cost, external_cost, consultancy_fee, water_tank_cost = other_cost_lines
+        results["breakdown"] = {
+            "buildings": building_lines,
+            "other_costs": [
+                {"item": "fence", "percent": other_costs_details.get('fence_percent', 0), "amount": float(fence_cost)},
+                {"item": "septic", "percent": other_costs_details.get('septic_percent', 0), "amount": float(septic_cost)},
+                {"item": "external_works", "percent": other_costs_details.get('external_works_percent', 0), "amount": float(external_cost)},
+                {"item": "consultancy", "percent": other_costs_details.get('consultancy_percent', 0), "amount": float(consultancy_fee)},
+                {"item": "water_tank", "percent": None, "amount": float(water_tank_cost)},
+            ],
+            "location": {
+                "plot_area": float(property_details.get('plot_area', 0)),
+                "rate_per_m2": get_location_rate_per_m2(property_details.get('prop_town', '')),
+                "calculated_value": float(calculated_lv),
+                "limit": float(lv_limit),
+                "limit_rule": explain_location_value_limit(ccw, property_details.get('plot_area', 0)),
+                "capped": bool(lv_limit < calculated_lv),
+                "applied_value": float(final_location_value),
+            },
+        }
+    return results
+
+# --- Valuation Stages ---
+def value_buildings(buildings: list, explain: bool = False) -> tuple:
+    """Returns `(building_costs, suggested_grades, breakdown_lines)`; lines are None unless `explain`."""
+    building_costs = []
+    suggested_grades = {}
+    building_lines = [] if explain else None
+    for i, building in enumerate(buildings):
+        if explain:
+            building_cost, suggested_grade, line = value_building(building, explain=True)
+            building_lines.append(line)
+        else:
+            building_cost, suggested_grade = building_cost_cache.get_or_compute(
+                building_spec_key(building, "float"), lambda: value_building(building)[:2])
+        if suggested_grade is not None:
+            suggested_grades[f"Building {i+1} ({building.get('name')})"] = suggested_grade
+        building_costs.append(building_cost)
+    return building_costs, suggested_grades, building_lines
+
+def calculate_other_cost_lines(ccw: float, other_costs_details: dict) -> tuple:
+    """Returns `(fence, septic, external_works, consultancy, water_tank)` costs."""
     fence_cost = ccw * (other_costs_details.get('fence_percent', 0) / 100)
     septic_cost = ccw * (other_costs_details.get('septic_percent', 0) / 100)
     external_cost = ccw * (other_costs_details.get('external_works_percent', 0) / 100)
     consultancy_fee = ccw * (other_costs_details.get('consultancy_percent', 0) / 100)
     water_tank_cost = other_costs_details.get('water_tank_cost', 0)
-    total_other_costs = fence_cost + septic_cost + external_cost + consultancy_fee + water_tank_cost
+    return fence_cost, septic_cost, external_cost, consultancy_fee, water_tank_cost
 
-    property_details = valuation_data.get('property_details', {})
+def calculate_location_stage(ccw: float, property_details: dict) -> tuple:
+    """Returns `(calculated_location_value, location_value_limit, final_applied_location_value)`."""
     calculated_lv = calculate_location_value(property_details.get('prop_town', ''), property_details.get('gen_use', ''), property_details.get('plot_grade', ''), property_details.get('plot_area', 0))
     lv_limit = calculate_location_value_limit(ccw, property_details.get('plot_area', 0))
-    final_location_value = min(calculated_lv, lv_limit)
+    return calculated_lv, lv_limit, min(calculated_lv, lv_limit)
 
+def combine_valuation_stages(ccw, total_other_costs, final_location_value, calculated_lv, lv_limit, suggested_grades) -> dict:
     total_market_value = ccw + total_other_costs + final_location_value
     forced_value = total_market_value * 0.8
-
     return {
         "total_building_cost": ccw,
         "total_other_costs": total_other_costs,
@@ -170,5 +402,312 @@ def run_full_valuation(valuation_data: dict) -> dict:
         "final_applied_location_value": final_location_value,
         "estimated_market_value": total_market_value,
         "estimated_forced_value": forced_value,
-        "suggested_grades": all_suggested_grades
+        "suggested_grades": suggested_grades
+    }
+
+# --- Incremental Re-Estimation ---
+def run_valuation_with_state(valuation_data: dict) -> tuple:
+    """
+    Runs a full valuation and also returns a reusable state for `reestimate`:
+    per-building costs, ccw, the other-cost and location inputs and the
+    results of each stage.
+    """
+    building_costs, suggested_grades, _ = value_buildings(valuation_data.get('buildings', []))
+    ccw = sum(building_costs)
+    state = {
+        "building_costs": building_costs,
+        "suggested_grades": suggested_grades,
+        "ccw": ccw,
+        "other_costs": dict(valuation_data.get('other_costs', {})),
+        "property_details": dict(valuation_data.get('property_details', {})),
+    }
+    state["total_other_costs"] = sum(calculate_other_cost_lines(ccw, state["other_costs"]))
+    state["location"] = list(calculate_location_stage(ccw, state["property_details"]))
+    return _results_from_state(state), state
+
+def reestimate(state: dict, other_costs: dict = None, property_details: dict = None) -> tuple:
+    """
+    Applies changed other-cost and/or property fields to a state from
+    `run_valuation_with_state`; the buildings are never revalued. Returns
+    `(results, new_state)`, equal to what `run_full_valuation` gives for the
+    edited request.
+
+    Only the per-building costs and grades are taken from the state (the API
+    signs states it hands out); `ccw` must equal their sum, and the other-cost
+    and location stages are always recomputed from it, which is cheap.
+    """
+    ccw = sum(state["building_costs"])
+    if not math.isclose(ccw, state["ccw"], rel_tol=1e-9, abs_tol=1e-6):
+        raise ValueError("Inconsistent state: ccw does not match the building costs")
+    new_state = {
+        **state,
+        "ccw": ccw,
+        "other_costs": {**state["other_costs"], **(other_costs or {})},
+        "property_details": {**state["property_details"], **(property_details or {})},
+    }
+    new_state["total_other_costs"] = sum(calculate_other_cost_lines(ccw, new_state["other_costs"]))
+    new_state["location"] = list(calculate_location_stage(ccw, new_state["property_details"]))
+    return _results_from_state(new_state), new_state
+
+def _results_from_state(state: dict) -> dict:
+    calculated_lv, lv_limit, final_location_value = state["location"]
+    return combine_valuation_stages(state["ccw"], state["total_other_costs"], final_location_value,
+                                    calculated_lv, lv_limit, state["suggested_grades"])
+
+
+# --- Exact-Money Batch Valuation ---
+def _collect_exact_columns(valuations: list) -> dict:
+    """Flattens the buildings of several valuations into per-building columns."""
+    columns = {
+        "owner": [], "length": [], "width": [], "storeys": [], "rate_cents": [],
+        "completed_hundredths": [], "specialized_cents": [], "is_standard": [],
     }
+    suggested_grades = []
+    for owner, valuation_data in enumerate(valuations):
+        grades = {}
+        for i, building in enumerate(valuation_data.get('buildings', [])):
+            suggested_grade, rate_cents, completed, specialized_cents = building_cost_cache.get_or_compute(
+                building_spec_key(building, "exact"), lambda: _exact_building_inputs(building))
+            columns["owner"].append(owner)
+            if suggested_grade is not None:
+                grades[f"Building {i+1} ({building.get('name')})"] = suggested_grade
+                columns["length"].append(building.get('length') or 0)
+                columns["width"].append(building.get('width') or 0)
+                columns["storeys"].append((building.get('num_floors') or 0) + 1)
+                columns["is_standard"].append(True)
+            else:
+                columns["length"].append(0)
+                columns["width"].append(0)
+                columns["storeys"].append(0)
+                columns["is_standard"].append(False)
+            columns["rate_cents"].append(rate_cents)
+            columns["completed_hundredths"].append(completed)
+            columns["specialized_cents"].append(specialized_cents)
+        suggested_grades.append(grades)
+    return {"buildings": columns, "suggested_grades": suggested_grades}
+
+def _exact_building_inputs(building: dict) -> tuple:
+    """Returns `(suggested_grade, rate_cents, completed_hundredths, specialized_cents)` for one building."""
+    category = building.get('category', 'Multi-Story Building')
+    if category not in STANDARD_CATEGORIES:
+        return None, 0, 100, calculate_specialized_value_cents(category, building.get('specialized_components') or {})
+    building_type_for_rate = get_building_type_for_rate(category, building.get('num_floors') or 0)
+    suggested_grade = suggest_grade_from_materials(building.get('selected_materials') or {}, category)
+    grade = building.get('confirmed_grade') or suggested_grade
+    completed = 100
+    if building.get('is_under_construction', False):
+        completed = get_completed_hundredths(building_type_for_rate, grade, building.get('incomplete_components') or [])
+    return suggested_grade, get_building_grade_rate_cents(building_type_for_rate, grade), completed, 0
+
+def calculate_building_costs_cents(length, width, storeys, rate_cents, completed_hundredths,
+                                   specialized_cents, is_standard) -> np.ndarray:
+    """Vectorized int64 building costs in cents.
+
+    Lengths and widths are quantized to centimetres, so area * storeys * rate is
+    an exact integer in cm2 * cents that is rounded once to cents; the
+    under-construction share is applied afterwards with a second rounding.
+    """
+    length_cm = to_cents_array(length)
+    width_cm = to_cents_array(width)
+    # Very large (but valid) buildings overflow int64 here; such batches use Python ints
+    bound = (max_abs(length_cm) * max_abs(width_cm) * max_abs(storeys) * max_abs(rate_cents)
+             * max(max_abs(completed_hundredths), 1))
+    length_cm, width_cm, storeys, rate_cents, completed_hundredths, specialized_cents = exact_int_arrays(
+        length_cm, width_cm, storeys, rate_cents, completed_hundredths, specialized_cents, bound=bound)
+    full_cost = div_round_array(length_cm * width_cm * storeys * rate_cents, 10000)
+    standard_cost = div_round_array(full_cost * completed_hundredths, 100)
+    return np.where(np.asarray(is_standard, dtype=bool), standard_cost, specialized_cents)
+
+def calculate_property_values_cents(ccw, fence_percent, septic_percent, external_works_percent,
+                                   consultancy_percent, water_tank_cost, plot_area, location_rate_per_m2) -> dict:
+    """Vectorized other costs, location value and market/forced values per property, in cents."""
+    percents = [to_cents_array(percent) for percent in
+                (fence_percent, septic_percent, external_works_percent, consultancy_percent)]
+    water_tank = to_cents_array(water_tank_cost)
+    plot_area_c = to_cents_array(plot_area)
+    # Largest product formed below, with headroom for the sums and the forced value's * 8
+    bound = 64 * (max_abs(ccw) * max([1400000 + max_abs(plot_area_c)] + [max_abs(p) for p in percents])
+                  + max_abs(location_rate_per_m2) * max_abs(plot_area_c) + max_abs(water_tank))
+    ccw, water_tank, plot_area_c, location_rate_per_m2, *percents = exact_int_arrays(
+        ccw, water_tank, plot_area_c, location_rate_per_m2, *percents, bound=bound)
+
+    # ccw (cents) * percent (hundredths of a percent) / 10000, each line rounded on its own
+    fence, septic, external, consultancy = (div_round_array(ccw * percent, 10000) for percent in percents)
+    total_other = fence + septic + external + consultancy + water_tank
+
+    # rate (Birr/m2) * 100 * plot area (hundredths of m2) / 100
+    calculated_lv = location_rate_per_m2 * plot_area_c
+
+    # Same bands as calculate_location_value_limit, with plot area in hundredths of m2:
+    # 3.5 * ccw - ccw * plot_area / 4000 == ccw * (1400000 - plot_area_c) / 400000
+    sliding_limit = div_round_array(ccw * (1400000 - plot_area_c), 400000)
+    lv_limit = np.where(plot_area_c <= 200000, 3 * ccw,
+                        np.where((plot_area_c >= 200100) & (plot_area_c <= 1000000), sliding_limit, ccw))
+    lv_limit = np.where(ccw == 0, 0, lv_limit)
+    final_lv = np.minimum(calculated_lv, lv_limit)
+
+    market_value = ccw + total_other + final_lv
+    return {
+        "total_building_cost": ccw,
+        "total_other_costs": total_other,
+        "calculated_location_value": calculated_lv,
+        "location_value_limit": lv_limit,
+        "final_applied_location_value": final_lv,
+        "estimated_market_value": market_value,
+        "estimated_forced_value": div_round_array(market_value * 8, 10),
+    }
+
+def run_batch_valuation(valuations: list, exact_money: bool = False) -> list:
+    """
+    Values several properties at once and returns one result per valuation.
+
+    In exact-money mode every amount is an int64 number of cents (rounded half away
+    from zero, see core.money) and the arithmetic is vectorized across all buildings
+    of the batch, so portfolio totals do not depend on evaluation order.
+    """
+    if not exact_money:
+        return [run_full_valuation(valuation_data) for valuation_data in valuations]
+    if not valuations:
+        return []
+
+    collected = _collect_exact_columns(valuations)
+    columns = collected["buildings"]
+    building_costs = calculate_building_costs_cents(
+        columns["length"], columns["width"], columns["storeys"], columns["rate_cents"],
+        columns["completed_hundredths"], columns["specialized_cents"], columns["is_standard"])
+    ccw = group_sum_exact(building_costs, columns["owner"], len(valuations))
+
+    other_costs = [valuation_data.get('other_costs', {}) for valuation_data in valuations]
+    property_details = [valuation_data.get('property_details', {}) for valuation_data in valuations]
+    values = calculate_property_values_cents(
+        ccw,
+        [costs.get('fence_percent', 0) for costs in other_costs],
+        [costs.get('septic_percent', 0) for costs in other_costs],
+        [costs.get('external_works_percent', 0) for costs in other_costs],
+        [costs.get('consultancy_percent', 0) for costs in other_costs],
+        [costs.get('water_tank_cost', 0) for costs in other_costs],
+        [details.get('plot_area', 0) for details in property_details],
+        [get_location_rate_per_m2(details.get('prop_town', '')) for details in property_details])
+    return [
+        {**{field: int(values[field][i]) for field in MONEY_FIELDS}, "suggested_grades": collected["suggested_grades"][i]}
+        for i in range(len(valuations))
+    ]
+
+def portfolio_totals(results: list) -> dict:
+    """Sums the money fields of exact-money results; integer sums are order independent."""
+    return {field: sum(result[field] for result in results) for field in MONEY_FIELDS}
+
+def valuation_to_birr(result: dict) -> dict:
+    """Converts an exact-money result (cents) into the Birr amounts used by the API."""
+    return {key: from_cents(value) if key in MONEY_FIELDS else value for key, value in result.items()}
+
+
+# --- Struct-of-Arrays Portfolio Valuation ---
+BUILDING_TYPES_FOR_RATE = ("Single Story Building (higher Villa)", "G+1 and G+2", "G+3 and G+4", "G+7 and Above")
+
+def calculate_property_values(ccw, fence_percent, septic_percent, external_works_percent,
+                              consultancy_percent, water_tank_cost, plot_area, location_rate_per_m2) -> dict:
+    """Vectorized float counterpart of `calculate_property_values_cents`, same formulas as `run_full_valuation`."""
+    ccw = np.asarray(ccw, dtype=np.float64)
+    plot_area = np.asarray(plot_area, dtype=np.float64)
+    total_other = (ccw * (np.asarray(fence_percent) / 100) + ccw * (np.asarray(septic_percent) / 100)
+                   + ccw * (np.asarray(external_works_percent) / 100) + ccw * (np.asarray(consultancy_percent) / 100)
+                   + np.asarray(water_tank_cost, dtype=np.float64))
+    calculated_lv = np.asarray(location_rate_per_m2, dtype=np.float64) * plot_area
+    lv_limit = np.where(plot_area <= 2000, 3.0 * ccw,
+                        np.where((plot_area >= 2001) & (plot_area <= 10000),
+                                 (3.5 * ccw) - (ccw * plot_area / 4000), 1.0 * ccw))
+    lv_limit = np.where(ccw == 0, 0.0, lv_limit)
+    final_lv = np.minimum(calculated_lv, lv_limit)
+    market_value = ccw + total_other + final_lv
+    return {
+        "total_building_cost": ccw,
+        "total_other_costs": total_other,
+        "calculated_location_value": calculated_lv,
+        "location_value_limit": lv_limit,
+        "final_applied_location_value": final_lv,
+        "estimated_market_value": market_value,
+        "estimated_forced_value": market_value * 0.8,
+    }
+
+def run_portfolio_valuation(portfolio, exact_money: bool = False) -> list:
+    """
+    Values a `core.portfolio.Portfolio` directly from its columns and returns one
+    result per property, in the same shape as `run_full_valuation`.
+
+    Rates and under-construction deductions are looked up once per distinct
+    (building type, grade, incomplete components) combination and broadcast.
+    """
+    n = portfolio.num_buildings
+    grade_names = portfolio.grades.values
+    category = portfolio.category.astype(np.int64)
+    is_standard = category < len(STANDARD_CATEGORIES)
+    floors = np.maximum(portfolio.num_floors.astype(np.int64), 0)
+    type_idx = np.where(category == STANDARD_CATEGORIES.index("Higher Villa"), 0,
+                        np.where((floors >= 1) & (floors <= 2), 1, np.where((floors >= 3) & (floors <= 4), 2, 3)))
+    grade = np.where(portfolio.confirmed_grade >= 0, portfolio.confirmed_grade, portfolio.suggested_grade).astype(np.int64)
+    grade = np.where(is_standard, grade, 0)
+    length = np.nan_to_num(portfolio.length)
+    width = np.nan_to_num(portfolio.width)
+
+    # Specialized component lines: building row, component code and rate per (category, component)
+    spec_building = np.repeat(np.arange(n), np.diff(portfolio.spec_offsets))
+    spec_rates = np.zeros((len(portfolio.categories.values), len(portfolio.spec_components.values)))
+    for cat_name, component_rates, rates in (("Fuel Station", FUEL_STATION_COMPONENT_RATES, fuel_station_rates),
+                                             ("Coffee Washing Site", COFFEE_SITE_COMPONENT_RATES, coffee_site_rates)):
+        for component, rate_key in component_rates.items():
+            spec_rates[portfolio.categories.code(cat_name), portfolio.spec_components.code(component)] = rates[rate_key]
+    spec_line_rates = spec_rates[category[spec_building], portfolio.spec_component]
+
+    # Completed share for under-construction buildings, once per distinct combination
+    uc_rows = np.flatnonzero(portfolio.under_construction_mask() & is_standard)
+    uc_keys, uc_inverse = np.unique(
+        np.stack([type_idx[uc_rows], grade[uc_rows], portfolio.incomplete_components[uc_rows]], axis=1),
+        axis=0, return_inverse=True)
+    uc_inverse = uc_inverse.reshape(-1)
+    owner = np.repeat(np.arange(portfolio.num_properties), np.diff(portfolio.building_offsets))
+
+    if exact_money:
+        rate_table = np.array([[get_building_grade_rate_cents(t, g) for g in grade_names] for t in BUILDING_TYPES_FOR_RATE], dtype=np.int64)
+        completed = np.full(n, 100, dtype=np.int64)
+        if len(uc_rows):
+            completed[uc_rows] = np.array([
+                get_completed_hundredths(BUILDING_TYPES_FOR_RATE[t], grade_names[g], list(portfolio.component_sets.values[c]))
+                for t, g, c in uc_keys], dtype=np.int64)[uc_inverse]
+        spec_quantity_c, spec_rate_c = to_cents_array(portfolio.spec_quantity), to_cents_array(spec_line_rates)
+        spec_quantity_c, spec_rate_c = exact_int_arrays(
+            spec_quantity_c, spec_rate_c, bound=max_abs(spec_quantity_c) * max_abs(spec_rate_c))
+        spec_lines = div_round_array(spec_quantity_c * spec_rate_c, 100)
+        specialized = group_sum_exact(spec_lines, spec_building, n)
+        building_costs = calculate_building_costs_cents(
+            length, width, floors + 1, rate_table[type_idx, grade], completed, specialized, is_standard)
+        ccw = group_sum_exact(building_costs, owner, portfolio.num_properties)
+        property_values = calculate_property_values_cents
+    else:
+        rate_table = np.array([[get_building_grade_rate(t, g) for g in grade_names] for t in BUILDING_TYPES_FOR_RATE], dtype=np.float64)
+        completed = np.ones(n)
+        if len(uc_rows):
+            completed[uc_rows] = np.array([
+                calculate_under_construction_value(1.0, BUILDING_TYPES_FOR_RATE[t], grade_names[g], list(portfolio.component_sets.values[c]))
+                for t, g, c in uc_keys])[uc_inverse]
+        specialized = np.bincount(spec_building, weights=portfolio.spec_quantity * spec_line_rates, minlength=n)
+        standard_costs = length * width * (floors + 1) * rate_table[type_idx, grade] * completed
+        building_costs = np.where(is_standard, standard_costs, specialized)
+        ccw = np.bincount(owner, weights=building_costs, minlength=portfolio.num_properties)
+        property_values = calculate_property_values
+
+    values = property_values(
+        ccw, portfolio.fence_percent, portfolio.septic_percent, portfolio.external_works_percent,
+        portfolio.consultancy_percent, portfolio.water_tank_cost, portfolio.plot_area,
+        [get_location_rate_per_m2(portfolio.strings.values[code]) for code in portfolio.prop_town])
+    to_python = int if exact_money else float
+
+    results = []
+    for p in range(portfolio.num_properties):
+        start = portfolio.building_offsets[p]
+        suggested_grades = {
+            f"Building {b - start + 1} ({portfolio.names[b]})": grade_names[portfolio.suggested_grade[b]]
+            for b in range(start, portfolio.building_offsets[p + 1]) if is_standard[b]
+        }
+        results.append({**{field: to_python(values[field][p]) for field in MONEY_FIELDS}, "suggested_grades": suggested_grades})
+    return results
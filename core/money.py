@@ -0,0 +1,80 @@
+# core/money.py
+
+import math
+
+import numpy as np
+
+# Rounding rule used everywhere in exact-money mode: round half away from zero.
+# Inputs are quantized from their binary float value, so 1.005 (stored as
+# 1.00499999...) becomes 100 cents. Scalar and vectorized helpers perform the
+# same IEEE operations and therefore always agree.
+#
+# Vectorized columns are int64 while every intermediate product fits with
+# headroom for `div_round`'s doubling; otherwise they switch to object arrays
+# of Python ints, which cannot overflow (see `exact_int_arrays`).
+INT64_SAFE_BOUND = 2 ** 62
+
+
+def to_cents(amount: float) -> int:
+    """Quantizes an amount (Birr, m, m2, percent...) to integer hundredths."""
+    if amount is None:
+        return 0
+    cents = math.floor(abs(amount) * 100 + 0.5)
+    return -cents if amount < 0 else cents
+
+
+def from_cents(cents: int) -> float:
+    """Converts integer cents back to a Birr float for display / API responses."""
+    return cents / 100
+
+
+def div_round(numerator: int, denominator: int) -> int:
+    """Integer division rounded half away from zero (denominator must be > 0)."""
+    quotient = (abs(numerator) * 2 + denominator) // (2 * denominator)
+    return -quotient if numerator < 0 else quotient
+
+
+def to_cents_array(amounts) -> np.ndarray:
+    """Vectorized `to_cents` returning an int64 array; ValueError for NaN, inf or out-of-range amounts."""
+    values = np.asarray(amounts, dtype=np.float64)
+    if not np.all(np.abs(values) < INT64_SAFE_BOUND / 100):
+        raise ValueError("Amount out of range for exact money")
+    cents = np.floor(np.abs(values) * 100 + 0.5).astype(np.int64)
+    return np.where(values < 0, -cents, cents)
+
+
+def div_round_array(numerator: np.ndarray, denominator) -> np.ndarray:
+    """Vectorized `div_round` on int64 (or Python-int object) arrays."""
+    numerator, denominator = np.asarray(numerator), np.asarray(denominator)
+    if numerator.dtype != object:
+        numerator = numerator.astype(np.int64)
+    if denominator.dtype != object:
+        denominator = denominator.astype(np.int64)
+    quotient = (np.abs(numerator) * 2 + denominator) // (2 * denominator)
+    return np.where(numerator < 0, -quotient, quotient)
+
+
+def max_abs(values) -> int:
+    """Largest magnitude in an integer array as a Python int (0 when empty)."""
+    values = np.asarray(values)
+    return int(np.max(np.abs(values))) if values.size else 0
+
+
+def exact_int_arrays(*arrays, bound: int = 0) -> list:
+    """
+    Converts integer columns for exact-money arithmetic: int64 when `bound` (the
+    largest intermediate magnitude the caller will form) and every value fit
+    below `INT64_SAFE_BOUND`, otherwise object arrays of Python ints.
+    """
+    columns = [np.asarray(array) for array in arrays]
+    largest = max([bound] + [max_abs(column) for column in columns])
+    dtype = np.int64 if largest < INT64_SAFE_BOUND else object
+    return [column.astype(dtype) for column in columns]
+
+
+def group_sum_exact(values, groups, size: int) -> np.ndarray:
+    """Sums integer `values` into `size` totals by group index without overflowing."""
+    (values,) = exact_int_arrays(values, bound=max_abs(values) * len(values))
+    totals = np.zeros(size, dtype=values.dtype)
+    np.add.at(totals, np.asarray(groups, dtype=np.intp), values)
+    return totals
@@ -0,0 +1,257 @@
+# core/portfolio.py
+
+import sys
+
+import numpy as np
+
+from .calculation_engine import (
+    STANDARD_CATEGORIES, FUEL_STATION_COMPONENT_RATES, COFFEE_SITE_COMPONENT_RATES,
+    suggest_grade_from_materials,
+)
+
+GRADES = ("Excellent", "Good", "Average", "Economy", "Minimum")
+CATEGORIES = tuple(STANDARD_CATEGORIES) + ("Fuel Station", "Coffee Washing Site")
+SPECIALIZED_COMPONENTS = tuple(FUEL_STATION_COMPONENT_RATES) + tuple(COFFEE_SITE_COMPONENT_RATES)
+
+
+class Interner:
+    """Maps repeated values (categories, grades, material selections...) to small integer codes."""
+    __slots__ = ("values", "_codes")
+
+    def __init__(self, initial=()):
+        self.values = []
+        self._codes = {}
+        for value in initial:
+            self.code(value)
+
+    def code(self, value) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self._codes[value] = code
+            self.values.append(value)
+        return code
+
+
+class Portfolio:
+    """
+    Struct-of-arrays container for large portfolios, consumed directly by
+    `run_portfolio_valuation`.
+
+    Buildings of property `p` occupy rows `building_offsets[p]:building_offsets[p + 1]`
+    of the building columns. Categories, grades, material selections, incomplete
+    component lists and location strings are interned, so repeated standard
+    designs cost a few bytes each. The specialized components of building `b` are
+    `spec_component[spec_offsets[b]:spec_offsets[b + 1]]` with matching
+    `spec_quantity`. Missing lengths/widths are NaN, missing floors -1 and
+    missing grades/materials -1. Category, grade, component and floor columns
+    use the narrowest integer type that holds their values (int8 for the usual
+    tables).
+    """
+
+    def __init__(self):
+        self.categories = Interner(CATEGORIES)
+        self.grades = Interner(GRADES)
+        self.material_sets = Interner()  # tuple of (component, material) pairs
+        self.component_sets = Interner()  # tuple of incomplete component names
+        self.spec_components = Interner(SPECIALIZED_COMPONENTS)
+        self.strings = Interner()  # town / use / plot grade strings
+        self.names = []
+
+        # Property columns
+        self.building_offsets = np.zeros(1, dtype=np.int64)
+        self.plot_area = np.zeros(0, dtype=np.float64)
+        self.prop_town = np.zeros(0, dtype=np.int32)
+        self.gen_use = np.zeros(0, dtype=np.int32)
+        self.plot_grade = np.zeros(0, dtype=np.int32)
+        self.fence_percent = np.zeros(0, dtype=np.float64)
+        self.septic_percent = np.zeros(0, dtype=np.float64)
+        self.external_works_percent = np.zeros(0, dtype=np.float64)
+        self.consultancy_percent = np.zeros(0, dtype=np.float64)
+        self.water_tank_cost = np.zeros(0, dtype=np.float64)
+
+        # Building columns
+        self.length = np.zeros(0, dtype=np.float64)
+        self.width = np.zeros(0, dtype=np.float64)
+        self.num_floors = np.zeros(0, dtype=np.int16)
+        self.category = np.zeros(0, dtype=np.int8)
+        self.confirmed_grade = np.zeros(0, dtype=np.int8)
+        self.suggested_grade = np.zeros(0, dtype=np.int8)
+        self.materials = np.zeros(0, dtype=np.int32)
+        self.incomplete_components = np.zeros(0, dtype=np.int32)
+        self.under_construction = np.zeros(0, dtype=np.uint8)  # packed bitmask
+        self.spec_offsets = np.zeros(1, dtype=np.int64)
+        self.spec_component = np.zeros(0, dtype=np.int16)
+        self.spec_quantity = np.zeros(0, dtype=np.float64)
+
+    @property
+    def num_properties(self) -> int:
+        return len(self.building_offsets) - 1
+
+    @property
+    def num_buildings(self) -> int:
+        return len(self.length)
+
+    def __len__(self):
+        return self.num_properties
+
+    @classmethod
+    def from_requests(cls, valuations: list) -> "Portfolio":
+        """Builds a portfolio from `ValuationRequest`-shaped dicts (or models exposing `.dict()`)."""
+        portfolio = cls()
+        props = {key: [] for key in ("plot_area", "prop_town", "gen_use", "plot_grade", "fence_percent",
+                                     "septic_percent", "external_works_percent", "consultancy_percent",
+                                     "water_tank_cost")}
+        cols = {key: [] for key in ("length", "width", "num_floors", "category", "confirmed_grade",
+                                    "suggested_grade", "materials", "incomplete_components",
+                                    "under_construction", "spec_component", "spec_quantity")}
+        building_offsets, spec_offsets = [0], [0]
+
+        for valuation_data in valuations:
+            if not isinstance(valuation_data, dict):
+                valuation_data = valuation_data.dict()
+            details = valuation_data.get('property_details', {})
+            costs = valuation_data.get('other_costs', {})
+            props["plot_area"].append(details.get('plot_area', 0))
+            for key in ("prop_town", "gen_use", "plot_grade"):
+                props[key].append(portfolio.strings.code(details.get(key, '')))
+            for key in ("fence_percent", "septic_percent", "external_works_percent", "consultancy_percent", "water_tank_cost"):
+                props[key].append(costs.get(key, 0))
+
+            for building in valuation_data.get('buildings', []):
+                category = building.get('category', 'Multi-Story Building')
+                materials = building.get('selected_materials')
+                confirmed = building.get('confirmed_grade')
+                portfolio.names.append(building.get('name'))
+                cols["length"].append(np.nan if building.get('length') is None else building['length'])
+                cols["width"].append(np.nan if building.get('width') is None else building['width'])
+                cols["num_floors"].append(-1 if building.get('num_floors') is None else building['num_floors'])
+                cols["category"].append(portfolio.categories.code(category))
+                cols["confirmed_grade"].append(-1 if not confirmed else portfolio.grades.code(confirmed))
+                cols["suggested_grade"].append(
+                    portfolio.grades.code(suggest_grade_from_materials(materials or {}, category))
+                    if category in STANDARD_CATEGORIES else -1)
+                cols["materials"].append(-1 if materials is None else portfolio.material_sets.code(tuple(materials.items())))
+                cols["incomplete_components"].append(
+                    portfolio.component_sets.code(tuple(building.get('incomplete_components') or ())))
+                cols["under_construction"].append(bool(building.get('is_under_construction')))
+                for component, quantity in (building.get('specialized_components') or {}).items():
+                    cols["spec_component"].append(portfolio.spec_components.code(component))
+                    cols["spec_quantity"].append(quantity)
+                spec_offsets.append(len(cols["spec_component"]))
+            building_offsets.append(len(cols["length"]))
+
+        portfolio.building_offsets = np.array(building_offsets, dtype=np.int64)
+        portfolio.spec_offsets = np.array(spec_offsets, dtype=np.int64)
+        for key in ("plot_area", "fence_percent", "septic_percent", "external_works_percent",
+                    "consultancy_percent", "water_tank_cost"):
+            setattr(portfolio, key, np.array(props[key], dtype=np.float64))
+        for key in ("prop_town", "gen_use", "plot_grade"):
+            setattr(portfolio, key, np.array(props[key], dtype=np.int32))
+        # Category, grade and component names are free text, so code widths follow the interned tables
+        category_dtype = _smallest_int_dtype(-1, len(portfolio.categories.values) - 1)
+        grade_dtype = _smallest_int_dtype(-1, len(portfolio.grades.values) - 1)
+        spec_dtype = _smallest_int_dtype(-1, len(portfolio.spec_components.values) - 1)
+        floors_dtype = _smallest_int_dtype(min(cols["num_floors"], default=0), max(cols["num_floors"], default=0))
+        for key, dtype in (("length", np.float64), ("width", np.float64), ("num_floors", floors_dtype),
+                           ("category", category_dtype), ("confirmed_grade", grade_dtype), ("suggested_grade", grade_dtype),
+                           ("materials", np.int32), ("incomplete_components", np.int32),
+                           ("spec_component", spec_dtype), ("spec_quantity", np.float64)):
+            setattr(portfolio, key, np.array(cols[key], dtype=dtype))
+        portfolio.under_construction = np.packbits(np.array(cols["under_construction"], dtype=bool))
+        return portfolio
+
+    def under_construction_mask(self) -> np.ndarray:
+        return np.unpackbits(self.under_construction, count=self.num_buildings).astype(bool)
+
+    def to_requests(self) -> list:
+        """Converts back to `ValuationRequest`-shaped dicts (one per property)."""
+        uc_mask = self.under_construction_mask()
+        valuations = []
+        for p in range(self.num_properties):
+            buildings = []
+            for b in range(self.building_offsets[p], self.building_offsets[p + 1]):
+                start, end = self.spec_offsets[b], self.spec_offsets[b + 1]
+                specialized = {
+                    self.spec_components.values[code]: float(quantity)
+                    for code, quantity in zip(self.spec_component[start:end], self.spec_quantity[start:end])
+                }
+                buildings.append({
+                    "name": self.names[b],
+                    "category": self.categories.values[self.category[b]],
+                    "length": None if np.isnan(self.length[b]) else float(self.length[b]),
+                    "width": None if np.isnan(self.width[b]) else float(self.width[b]),
+                    "num_floors": None if self.num_floors[b] < 0 else int(self.num_floors[b]),
+                    "selected_materials": None if self.materials[b] < 0 else dict(self.material_sets.values[self.materials[b]]),
+                    "confirmed_grade": None if self.confirmed_grade[b] < 0 else self.grades.values[self.confirmed_grade[b]],
+                    "is_under_construction": bool(uc_mask[b]),
+                    "incomplete_components": list(self.component_sets.values[self.incomplete_components[b]]),
+                    "specialized_components": specialized or None,
+                })
+            valuations.append({
+                "buildings": buildings,
+                "property_details": {
+                    "plot_area": float(self.plot_area[p]),
+                    "prop_town": self.strings.values[self.prop_town[p]],
+                    "gen_use": self.strings.values[self.gen_use[p]],
+                    "plot_grade": self.strings.values[self.plot_grade[p]],
+                },
+                "other_costs": {
+                    "fence_percent": _plain_number(self.fence_percent[p]),
+                    "septic_percent": _plain_number(self.septic_percent[p]),
+                    "external_works_percent": _plain_number(self.external_works_percent[p]),
+                    "consultancy_percent": _plain_number(self.consultancy_percent[p]),
+                    "water_tank_cost": float(self.water_tank_cost[p]),
+                },
+            })
+        return valuations
+
+    def memory_usage(self) -> dict:
+        """
+        Measured bytes held by the portfolio: numpy columns, names and interned
+        tables. Objects are counted once each by identity (a name shared by many
+        buildings is one string, equal names from different requests are not),
+        and interned tuples are measured together with the strings inside them.
+        """
+        seen = set()
+        array_bytes = sum(value.nbytes for value in vars(self).values() if isinstance(value, np.ndarray))
+        name_bytes = _deep_sizeof(self.names, seen)
+        # `_codes` keys are the same objects as `values`, so only the dicts add
+        table_bytes = sum(
+            _deep_sizeof(interner.values, seen) + sys.getsizeof(interner._codes)
+            for interner in (self.categories, self.grades, self.material_sets, self.component_sets,
+                             self.spec_components, self.strings))
+        total = array_bytes + name_bytes + table_bytes
+        return {
+            "columns": array_bytes,
+            "names": name_bytes,
+            "interned_tables": table_bytes,
+            "total": total,
+            "per_building": total / max(self.num_buildings, 1),
+        }
+
+
+def _smallest_int_dtype(low: int, high: int):
+    """Narrowest signed integer dtype holding every value in `[low, high]`."""
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return dtype
+    return np.int64
+
+
+def _deep_sizeof(value, seen: set) -> int:
+    """Size of `value` plus the list/tuple items it holds, skipping objects already in `seen`."""
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, (list, tuple)):
+        size += sum(_deep_sizeof(item, seen) for item in value)
+    return size
+
+
+def _plain_number(value):
+    """Returns ints for whole numbers so integer model fields round-trip unchanged."""
+    value = float(value)
+    return int(value) if value.is_integer() else value
@@ -0,0 +1,21 @@
+# gunicorn.conf.py
+#
+# Production server: the app is built and warmed once in the master, then
+# forked so workers share its tables copy-on-write.
+#
+#   gunicorn -c gunicorn.conf.py
+
+import gc
+import os
+
+wsgi_app = "api.main:create_app(preload=True)"
+worker_class = "uvicorn_worker.UvicornWorker"
+bind = f"0.0.0.0:{os.environ.get('PORT', '9000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", "2"))
+preload_app = True
+
+
+def when_ready(server):
+    # Move everything allocated during preload out of the collector's reach so
+    # garbage collections in the workers do not touch (and copy) shared pages.
+    gc.freeze()
@@ -0,0 +1,67 @@
+# tests/test_api.py
+
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.main import create_app
+from api.warmup import representative_requests
+
+
+@pytest.fixture
+def client():
+    return TestClient(create_app())
+
+
+def test_estimate_exact_money_rejects_unrepresentable_amounts(client):
+    payload = representative_requests()[0]
+    payload = {**payload, "property_details": {**payload["property_details"], "plot_area": 1e300}}
+    response = client.post("/estimate?exact_money=true", json=payload)
+    assert response.status_code == 400
+    assert client.post("/estimate", json=payload).status_code == 200
+
+
+def test_only_exact_money_requests_are_batched(client, monkeypatch):
+    monkeypatch.setattr("api.profiling.PROFILE_TOKEN", "secret")
+    payload = representative_requests()[0]
+    assert client.get("/admin/batching").status_code == 403
+    assert client.post("/estimate", json=payload).status_code == 200
+    assert client.get("/admin/batching", headers={"X-Profile": "secret"}).json()["items"] == 0
+    exact = client.post("/estimate?exact_money=true", json=payload)
+    assert exact.status_code == 200
+    assert exact.json()["estimated_market_value"] == pytest.approx(
+        client.post("/estimate", json=payload).json()["estimated_market_value"], abs=0.05)
+    assert client.get("/admin/batching", headers={"X-Profile": "secret"}).json()["items"] == 1
+
+
+def test_ready_after_warm_up():
+    with TestClient(create_app()) as client:
+        app = client.app
+        assert app.state.ready.wait(timeout=30)
+        assert client.get("/ready").json()["status"] == "ready"
+
+
+def test_failed_warm_up_is_reported(monkeypatch):
+    def broken_warm_up():
+        raise RuntimeError("rate tables missing")
+
+    monkeypatch.setattr("api.main.warm_up", broken_warm_up)
+    with pytest.raises(RuntimeError):
+        create_app(preload=True)
+    with TestClient(create_app()) as client:
+        for _ in range(100):
+            response = client.get("/ready")
+            if response.json()["status"] != "warming up":
+                break
+            time.sleep(0.05)
+        assert response.status_code == 503
+        assert response.json() == {"status": "failed", "error": "RuntimeError: rate tables missing"}
+
+
+def test_module_app_is_built_once_on_demand():
+    import api.main
+
+    assert isinstance(api.main.app, FastAPI)
+    assert api.main.app is api.main.app
@@ -0,0 +1,87 @@
+# tests/test_batching.py
+
+import asyncio
+
+from api.batching import MicroBatcher
+
+
+class RecordingBatch:
+    """Batch function doubling its items; fails the whole batch when an item is negative."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, items):
+        self.calls.append(list(items))
+        if any(item < 0 for item in items):
+            raise ValueError("negative item")
+        return [item * 2 for item in items]
+
+
+def test_concurrent_calls_share_one_batch():
+    batch = RecordingBatch()
+    batcher = MicroBatcher(batch, max_wait_ms=50)
+
+    async def main():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+
+    assert asyncio.run(main()) == [0, 2, 4, 6, 8]
+    assert batch.calls == [[0, 1, 2, 3, 4]]
+    assert batcher.stats()["batches"] == 1 and batcher.stats()["items"] == 5
+
+
+def test_full_batch_is_flushed_without_waiting():
+    batch = RecordingBatch()
+    batcher = MicroBatcher(batch, max_batch_size=2, max_wait_ms=10_000)
+
+    async def main():
+        return await asyncio.wait_for(asyncio.gather(*(batcher.submit(i) for i in range(4))), timeout=5)
+
+    assert asyncio.run(main()) == [0, 2, 4, 6]
+    assert batch.calls == [[0, 1], [2, 3]]
+
+
+def test_failed_batch_only_fails_the_bad_item():
+    batch = RecordingBatch()
+    batcher = MicroBatcher(batch, max_wait_ms=50)
+
+    async def main():
+        return await asyncio.gather(*(batcher.submit(i) for i in (1, -1, 3)), return_exceptions=True)
+
+    good, bad, other = asyncio.run(main())
+    assert (good, other) == (2, 6)
+    assert isinstance(bad, ValueError)
+    assert batch.calls == [[1, -1, 3], [1], [-1], [3]]
+
+
+def test_cancelled_caller_does_not_break_the_batch():
+    batch = RecordingBatch()
+    batcher = MicroBatcher(batch, max_wait_ms=50)
+
+    async def main():
+        cancelled = asyncio.ensure_future(batcher.submit(1))
+        others = [asyncio.ensure_future(batcher.submit(i)) for i in (2, 3)]
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        return await asyncio.gather(*others), cancelled.cancelled()
+
+    assert asyncio.run(main()) == ([4, 6], True)
+    assert batch.calls == [[1, 2, 3]]
+
+
+def test_wait_bound_includes_estimated_execution():
+    batch = RecordingBatch()
+    batcher = MicroBatcher(batch, max_wait_ms=50)
+    # Past batches took 30 ms per item: a second item would exceed the 50 ms bound
+    batcher.item_seconds = 0.030
+
+    async def main():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(3)))
+
+    assert asyncio.run(main()) == [0, 2, 4]
+    assert batch.calls == [[0, 1], [2]]
+
+
+def test_disabled_without_wait():
+    assert not MicroBatcher(RecordingBatch(), max_wait_ms=0).enabled
+    assert MicroBatcher(RecordingBatch(), max_wait_ms=2).enabled
@@ -0,0 +1,48 @@
+# tests/test_branch_index.py
+
+from core.branch_index import BranchIndex, branch_index, normalize_name
+from core.data_loader import get_branches_data
+
+BRANCHES = {
+    " North  District ": ["Bole", "bole  Medhanialem", "Arat Kilo"],
+    "South District": ["Adama", "Bole", "Abado", "Ab"],
+}
+
+
+def test_normalize_name():
+    assert normalize_name("  Bole   Medhanialem ") == "bole medhanialem"
+    assert normalize_name("STRASSE") == normalize_name("straße")
+
+
+def test_lookup_is_normalized_and_first_district_wins():
+    index = BranchIndex(BRANCHES)
+    assert index.lookup("  BOLE ") == {"branch": "Bole", "district": "North District"}
+    assert index.lookup("Bole Medhanialem") == {"branch": "bole Medhanialem", "district": "North District"}
+    assert index.district_of("abado") == "South District"
+    assert index.lookup("Unknown") is None and index.district_of("Unknown") is None
+    assert len(index) == 6
+
+
+def test_search_is_alphabetical_and_limited():
+    index = BranchIndex(BRANCHES)
+    assert [match["branch"] for match in index.search("")] == [
+        "Ab", "Abado", "Adama", "Arat Kilo", "Bole", "bole Medhanialem"]
+    assert [match["branch"] for match in index.search("a", limit=2)] == ["Ab", "Abado"]
+    assert [match["branch"] for match in index.search("BOLE ")] == ["Bole", "bole Medhanialem"]
+    assert index.search("x") == []
+
+
+def test_districts():
+    index = BranchIndex(BRANCHES)
+    assert index.districts() == ["North District", "South District"]
+    assert index.branches_in("North  District") == ("Bole", "bole Medhanialem", "Arat Kilo")
+    assert index.branches_in("Nowhere") == ()
+
+
+def test_real_index_matches_source_data():
+    for district, branches in get_branches_data().items():
+        for branch in branches:
+            assert branch_index.lookup(branch) is not None
+    names = [match["branch"] for match in branch_index.search("", limit=len(branch_index))]
+    assert len(names) == len(branch_index)
+    assert [normalize_name(name) for name in names] == sorted(normalize_name(name) for name in names)
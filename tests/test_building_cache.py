@@ -0,0 +1,74 @@
+# tests/test_building_cache.py
+
+import pytest
+
+from api.warmup import representative_requests
+from core.building_cache import BuildingCostCache
+from core.calculation_engine import building_cost_cache, building_spec_key, run_full_valuation
+
+BUILDINGS = representative_requests()[0]["buildings"]
+
+
+def test_lru_eviction_and_stats():
+    cache = BuildingCostCache(maxsize=2)
+    computed = []
+
+    def compute(value):
+        return lambda: computed.append(value) or value
+
+    assert cache.get_or_compute("a", compute(1)) == 1
+    assert cache.get_or_compute("b", compute(2)) == 2
+    assert cache.get_or_compute("a", compute(10)) == 1  # hit, "a" becomes most recent
+    assert cache.get_or_compute("c", compute(3)) == 3  # evicts "b"
+    assert cache.get_or_compute("b", compute(20)) == 20
+    assert computed == [1, 2, 3, 20]
+    assert cache.stats() == {"size": 2, "maxsize": 2, "hits": 1, "misses": 4, "evictions": 2, "hit_rate": 0.2}
+    cache.clear()
+    assert cache.stats()["size"] == 0 and cache.stats()["hits"] == 0
+
+
+def test_disabled_and_unhashable_keys_bypass_the_cache():
+    assert BuildingCostCache(maxsize=0).get_or_compute("a", lambda: 1) == 1
+    cache = BuildingCostCache()
+    assert cache.get_or_compute(None, lambda: 1) == 1
+    assert cache.stats()["size"] == 0 and cache.stats()["misses"] == 0
+
+
+def test_spec_key_ignores_name_and_input_order():
+    villa, fuel_station = BUILDINGS[0], BUILDINGS[6]
+    assert building_spec_key({**villa, "name": "Other"}, "float") == building_spec_key(villa, "float")
+    reordered = {**villa, "selected_materials": dict(reversed(list(villa["selected_materials"].items())))}
+    assert building_spec_key(reordered, "float") == building_spec_key(villa, "float")
+    reordered = {**fuel_station, "specialized_components": dict(reversed(list(fuel_station["specialized_components"].items())))}
+    assert building_spec_key(reordered, "float") == building_spec_key(fuel_station, "float")
+
+
+def test_spec_key_separates_what_changes_the_value():
+    villa, under_construction = BUILDINGS[0], BUILDINGS[1]
+    key = building_spec_key(villa, "float")
+    assert building_spec_key(villa, "exact") != key
+    assert building_spec_key({**villa, "length": 21.0}, "float") != key
+    assert building_spec_key({**villa, "confirmed_grade": "Economy"}, "float") != key
+    reordered = {**under_construction, "incomplete_components": under_construction["incomplete_components"][::-1]}
+    assert building_spec_key(reordered, "float") != building_spec_key(under_construction, "float")
+    assert building_spec_key({**villa, "selected_materials": {"Floor": ["unhashable"]}}, "float") is None
+
+
+@pytest.mark.parametrize("exact_money", [False, True])
+def test_cached_results_match_uncached(exact_money, monkeypatch):
+    valuations = representative_requests()
+    building_cost_cache.clear()
+    cold = [run_full_valuation(valuation_data, exact_money=exact_money) for valuation_data in valuations]
+    warm = [run_full_valuation(valuation_data, exact_money=exact_money) for valuation_data in valuations]
+    assert building_cost_cache.stats()["hits"] > 0
+    monkeypatch.setattr(building_cost_cache, "maxsize", 0)
+    assert cold == warm == [run_full_valuation(valuation_data, exact_money=exact_money) for valuation_data in valuations]
+
+
+def test_names_come_from_the_request_not_the_cache():
+    valuation_data = representative_requests()[0]
+    run_full_valuation(valuation_data)
+    renamed = {**valuation_data, "buildings": [
+        {**building, "name": f"Renamed {i}"} for i, building in enumerate(valuation_data["buildings"])]}
+    grades = run_full_valuation(renamed)["suggested_grades"]
+    assert list(grades) == [f"Building {i + 1} (Renamed {i})" for i in range(6)]  # the six standard buildings
@@ -0,0 +1,75 @@
+# tests/test_capture.py
+
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api import capture
+from api.main import create_app
+from api.warmup import representative_requests
+from core.calculation_engine import MONEY_FIELDS
+
+
+@pytest.fixture
+def capture_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(capture, "CAPTURE_DIR", str(tmp_path))
+    monkeypatch.setattr(capture, "CAPTURE_SAMPLE_RATE", 1.0)
+    monkeypatch.setattr(capture, "_logger", None)
+    yield tmp_path
+    logger = logging.getLogger("valuation.capture")
+    for handler in queue_handlers():
+        logger.removeHandler(handler)
+
+
+def queue_handlers() -> list:
+    return [handler for handler in logging.getLogger("valuation.capture").handlers
+            if isinstance(handler, capture._RecordQueueHandler)]
+
+
+def wait_for_records(directory, count: int) -> list:
+    for _ in range(100):
+        paths = list(directory.glob(f"{capture.CAPTURE_FILENAME}.*"))
+        records = capture.read_captures(paths) if paths else []
+        if len(records) >= count:
+            return records
+        time.sleep(0.02)
+    raise AssertionError(f"expected {count} capture records, found {len(records)}")
+
+
+def test_captured_records_are_sanitized(capture_dir):
+    payload = representative_requests()[0]
+    payload = {**payload, "buildings": [{**payload["buildings"][0], "name": "SECRET NAME"}]}
+    client = TestClient(create_app())
+    assert client.post("/estimate?explain=true", json=payload).status_code == 200
+    assert client.post("/estimate?exact_money=true", json=payload).status_code == 200
+
+    records = wait_for_records(capture_dir, 2)
+    assert "SECRET NAME" not in json.dumps(records)
+    assert [record["exact_money"] for record in records] == [False, True]
+    for record in records:
+        assert record["request"]["buildings"][0]["name"] == "Building 1"
+        assert set(record["results"]) == set(MONEY_FIELDS)
+        assert record["handler_ms"] >= 0
+
+
+def test_capture_failure_does_not_fail_the_request(tmp_path, capture_dir, monkeypatch):
+    blocker = tmp_path / "not-a-directory"
+    blocker.write_text("")
+    monkeypatch.setattr(capture, "CAPTURE_DIR", str(blocker / "captures"))
+    response = TestClient(create_app()).post("/estimate", json=representative_requests()[0])
+    assert response.status_code == 200
+
+
+def test_concurrent_setup_attaches_one_handler(capture_dir):
+    with ThreadPoolExecutor(8) as pool:
+        loggers = list(pool.map(lambda _: capture._get_logger(), range(32)))
+    assert all(logger is loggers[0] for logger in loggers)
+    assert len(queue_handlers()) == 1
+    client = TestClient(create_app())
+    for payload in representative_requests():
+        client.post("/estimate", json=payload)
+    assert len(wait_for_records(capture_dir, 3)) == 3
@@ -0,0 +1,59 @@
+# tests/test_exact_money.py
+
+import pytest
+
+from api.warmup import representative_requests
+from benchmarks.synthetic import make_valuation_requests
+from core.calculation_engine import (
+    MONEY_FIELDS, run_full_valuation, run_batch_valuation, valuation_to_birr,
+)
+
+REQUESTS = representative_requests() + make_valuation_requests(40, seed=1, max_buildings=4)
+
+
+def test_exact_money_within_a_cent_of_float():
+    for valuation_data in REQUESTS:
+        floats = run_full_valuation(valuation_data)
+        exact = valuation_to_birr(run_full_valuation(valuation_data, exact_money=True))
+        assert exact["suggested_grades"] == floats["suggested_grades"]
+        for field in MONEY_FIELDS:
+            # Every stage rounds to the cent, so allow one cent of drift per stage
+            assert exact[field] == pytest.approx(floats[field], abs=0.05), field
+
+
+def test_exact_money_amounts_are_int_cents():
+    results = run_full_valuation(REQUESTS[0], exact_money=True)
+    assert all(type(results[field]) is int for field in MONEY_FIELDS)
+
+
+@pytest.mark.parametrize("exact_money", [False, True])
+def test_batch_matches_single(exact_money):
+    single = [run_full_valuation(valuation_data, exact_money=exact_money) for valuation_data in REQUESTS]
+    assert run_batch_valuation(REQUESTS, exact_money=exact_money) == single
+
+
+LARGE_FACTORY = {
+    "buildings": [{"name": "Plant", "category": "MPH & Factory Building", "length": 600.0, "width": 600.0,
+                   "num_floors": 10, "selected_materials": {}}],
+    "property_details": {"plot_area": 5000.0, "prop_town": "Finfinne", "gen_use": "Industrial", "plot_grade": "1st"},
+    "other_costs": {"fence_percent": 5, "septic_percent": 2, "external_works_percent": 2,
+                    "consultancy_percent": 3, "water_tank_cost": 15508.0},
+}
+
+
+def test_exact_money_does_not_overflow_int64():
+    # ccw * (1400000 - plot area) exceeds int64 for this property
+    floats = run_full_valuation(LARGE_FACTORY)
+    single = valuation_to_birr(run_full_valuation(LARGE_FACTORY, exact_money=True))
+    batch = run_batch_valuation([LARGE_FACTORY] + REQUESTS[:3], exact_money=True)
+    assert batch[0] == run_full_valuation(LARGE_FACTORY, exact_money=True)
+    assert batch[1:] == [run_full_valuation(valuation_data, exact_money=True) for valuation_data in REQUESTS[:3]]
+    for field in MONEY_FIELDS:
+        assert single[field] > 0, field
+        assert single[field] == pytest.approx(floats[field], rel=1e-12), field
+
+
+def test_exact_money_rejects_unrepresentable_amounts():
+    huge = {**LARGE_FACTORY, "property_details": {**LARGE_FACTORY["property_details"], "plot_area": 1e300}}
+    with pytest.raises(ValueError):
+        run_full_valuation(huge, exact_money=True)
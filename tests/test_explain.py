@@ -0,0 +1,74 @@
+# tests/test_explain.py
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.main import create_app
+from api.warmup import representative_requests
+from benchmarks.synthetic import make_valuation_requests
+from core.calculation_engine import MONEY_FIELDS, run_full_valuation
+
+REQUESTS = representative_requests() + make_valuation_requests(20, seed=3, max_buildings=4)
+
+
+@pytest.mark.parametrize("valuation_data", REQUESTS)
+def test_breakdown_adds_up(valuation_data):
+    results = run_full_valuation(valuation_data, explain=True)
+    breakdown = results.pop("breakdown")
+    assert results == run_full_valuation(valuation_data)
+    json.dumps(breakdown)  # plain types only
+
+    lines = breakdown["buildings"]
+    assert len(lines) == len(valuation_data["buildings"])
+    assert sum(line["building_cost"] for line in lines) == pytest.approx(results["total_building_cost"], rel=1e-12)
+    for line in lines:
+        if "full_replacement_cost" in line:
+            assert line["full_replacement_cost"] == pytest.approx(line["area"] * (line["num_floors"] + 1) * line["rate"])
+            completed = 1 - sum(deduction["fraction"] for deduction in line["deductions"])
+            assert line["building_cost"] == pytest.approx(line["full_replacement_cost"] * completed)
+        else:
+            assert line["building_cost"] == pytest.approx(sum(c["amount"] for c in line["component_lines"]))
+
+    other_costs = breakdown["other_costs"]
+    assert sum(item["amount"] for item in other_costs) == pytest.approx(results["total_other_costs"], rel=1e-12)
+    for item in other_costs:
+        if item["percent"] is not None:
+            assert item["amount"] == pytest.approx(results["total_building_cost"] * item["percent"] / 100)
+
+
+@pytest.mark.parametrize("plot_area, rule", [
+    (500.0, "plot area <= 2000 m2"),
+    (4000.0, "plot area 2001-10000 m2"),
+    (15000.0, "other plot areas"),
+])
+def test_location_breakdown_matches_band(plot_area, rule):
+    valuation_data = representative_requests()[0]
+    valuation_data = {**valuation_data, "property_details": {**valuation_data["property_details"], "plot_area": plot_area}}
+    results = run_full_valuation(valuation_data, explain=True)
+    location = results["breakdown"]["location"]
+    assert location["limit_rule"].startswith(rule)
+    assert location["limit"] == results["location_value_limit"]
+    assert location["calculated_value"] == results["calculated_location_value"]
+    assert location["capped"] is (location["limit"] < location["calculated_value"])
+    assert location["applied_value"] == min(location["limit"], location["calculated_value"])
+
+
+def test_no_building_cost_rule():
+    valuation_data = {**representative_requests()[0], "buildings": []}
+    location = run_full_valuation(valuation_data, explain=True)["breakdown"]["location"]
+    assert location["limit_rule"].startswith("no building cost")
+    assert location["capped"] is True and location["applied_value"] == 0
+
+
+def test_estimate_explain_endpoint():
+    client = TestClient(create_app())
+    payload = representative_requests()[0]
+    body = client.post("/estimate?explain=true", json=payload).json()
+    assert {field: body[field] for field in MONEY_FIELDS} == pytest.approx(
+        {field: value for field, value in client.post("/estimate", json=payload).json().items() if field in MONEY_FIELDS})
+    deductions = [d for line in body["breakdown"]["buildings"] for d in line.get("deductions", [])]
+    assert deductions and all(0 < d["fraction"] < 1 for d in deductions)
+    assert "breakdown" not in client.post("/estimate", json=payload).json()
+    assert client.post("/estimate?explain=true&exact_money=true", json=payload).status_code == 400
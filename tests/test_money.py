@@ -0,0 +1,64 @@
+# tests/test_money.py
+
+import numpy as np
+import pytest
+
+from core.money import to_cents, from_cents, div_round, to_cents_array, div_round_array
+
+
+@pytest.mark.parametrize("amount, cents", [
+    (None, 0),
+    (0, 0),
+    (0.004, 0),
+    (0.005, 1),
+    (-0.005, -1),
+    (1.005, 100),  # stored as 1.00499999..., quantized from the binary value
+    (2.675, 268),  # 2.675 * 100 rounds up to 267.5 in binary
+    (-2.5, -250),
+    (12.345, 1235),
+    (-12.345, -1235),
+    (1e9, 100_000_000_000),
+])
+def test_to_cents(amount, cents):
+    assert to_cents(amount) == cents
+
+
+@pytest.mark.parametrize("numerator, denominator, quotient", [
+    (5, 10, 1),
+    (-5, 10, -1),
+    (4, 10, 0),
+    (-4, 10, 0),
+    (15, 10, 2),
+    (-15, 10, -2),
+    (149, 100, 1),
+    (150, 100, 2),
+    (0, 7, 0),
+])
+def test_div_round_half_away_from_zero(numerator, denominator, quotient):
+    assert div_round(numerator, denominator) == quotient
+
+
+def test_from_cents():
+    assert from_cents(12345) == 123.45
+    assert from_cents(-1) == -0.01
+
+
+def test_vectorized_helpers_match_scalar():
+    amounts = [0.0, 0.004, 0.005, -0.005, 1.005, 2.675, -2.5, 12.345, -12.345, 1e9]
+    assert to_cents_array(amounts).tolist() == [to_cents(amount) for amount in amounts]
+
+    numerators = np.array([5, -5, 4, -4, 15, -15, 149, 150, 0, 10**15 + 7], dtype=np.int64)
+    for denominator in (10, 100, 7):
+        assert div_round_array(numerators, denominator).tolist() == [
+            div_round(int(n), denominator) for n in numerators]
+
+
+def test_to_cents_array_rejects_out_of_range():
+    for amount in (1e17, float("inf"), float("nan")):
+        with pytest.raises(ValueError):
+            to_cents_array([1.0, amount])
+
+
+def test_div_round_array_on_python_ints():
+    numerators = np.array([10**30 + 5, -(10**30) - 5], dtype=object)
+    assert div_round_array(numerators, 10).tolist() == [10**29 + 1, -(10**29) - 1]
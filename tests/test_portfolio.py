@@ -0,0 +1,76 @@
+# tests/test_portfolio.py
+
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from api.warmup import representative_requests
+from benchmarks.synthetic import make_valuation_requests
+from core.calculation_engine import MONEY_FIELDS, run_full_valuation, run_portfolio_valuation
+from core.portfolio import Portfolio
+
+REQUESTS = representative_requests() + make_valuation_requests(40, seed=1, max_buildings=4)
+
+
+def assert_matches_single(valuations, exact_money=False):
+    results = run_portfolio_valuation(Portfolio.from_requests(valuations), exact_money=exact_money)
+    for valuation_data, result in zip(valuations, results):
+        expected = run_full_valuation(valuation_data, exact_money=exact_money)
+        assert result["suggested_grades"] == expected["suggested_grades"]
+        for field in MONEY_FIELDS:
+            if exact_money:
+                assert result[field] == expected[field], field
+            else:
+                assert result[field] == pytest.approx(expected[field], rel=1e-12), field
+
+
+@pytest.mark.parametrize("exact_money", [False, True])
+def test_portfolio_matches_single(exact_money):
+    assert_matches_single(REQUESTS, exact_money)
+
+
+def test_portfolio_round_trips_requests():
+    portfolio = Portfolio.from_requests(REQUESTS)
+    assert [run_full_valuation(valuation_data) for valuation_data in portfolio.to_requests()] == [
+        run_full_valuation(valuation_data) for valuation_data in REQUESTS]
+
+
+def test_many_free_text_categories_and_grades():
+    template = representative_requests()[0]
+    buildings = [
+        {**building, "category": f"Custom {i}"} if i % 2 else {**building, "confirmed_grade": f"Grade {i}"}
+        for i, building in enumerate(template["buildings"] * 40)
+    ]
+    valuations = [{**template, "buildings": buildings[i:i + 8]} for i in range(0, len(buildings), 8)]
+    portfolio = Portfolio.from_requests(valuations)
+    assert len(portfolio.categories.values) > 127 and len(portfolio.grades.values) > 127
+    assert portfolio.category.dtype == np.int16
+    assert_matches_single(valuations)
+
+
+def test_usual_tables_keep_narrow_codes():
+    portfolio = Portfolio.from_requests(REQUESTS)
+    assert portfolio.category.dtype == np.int8
+    assert portfolio.confirmed_grade.dtype == np.int8
+    assert portfolio.num_floors.dtype == np.int8
+
+
+def test_tall_buildings():
+    template = representative_requests()[0]
+    valuation_data = {**template, "buildings": [{**template["buildings"][2], "num_floors": 40000}]}
+    assert Portfolio.from_requests([valuation_data]).num_floors.dtype == np.int32
+    assert_matches_single([valuation_data])
+
+
+def test_memory_usage_counts_retained_strings():
+    def build():
+        return Portfolio.from_requests(make_valuation_requests(2000, seed=4, max_buildings=4))
+
+    tracemalloc.start()
+    portfolio = build()
+    traced, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Every building has its own name string, and they must be counted
+    assert portfolio.memory_usage()["names"] > portfolio.num_buildings * 40
+    assert portfolio.memory_usage()["total"] == pytest.approx(traced, rel=0.15)
@@ -0,0 +1,45 @@
+# tests/test_profiling.py
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api import profiling
+from api.main import create_app
+from api.warmup import representative_requests
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_TOKEN", "secret")
+    return TestClient(create_app())
+
+
+def test_is_admin_handles_non_ascii_tokens(monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_TOKEN", "secret")
+    assert profiling.is_admin("secret")
+    assert not profiling.is_admin("é")
+    assert not profiling.is_admin(None)
+    monkeypatch.setattr(profiling, "PROFILE_TOKEN", "sécret")
+    assert profiling.is_admin("sécret")
+
+
+def test_non_ascii_profile_header_is_not_an_error(client):
+    headers = {"X-Profile": "é".encode("latin-1")}
+    assert client.post("/estimate", json=representative_requests()[0], headers=headers).status_code == 200
+    assert client.get("/admin/profiles", headers=headers).status_code == 403
+
+
+def test_profiled_request_is_listed(client):
+    response = client.post("/estimate", json=representative_requests()[0], headers={"X-Profile": "secret"})
+    profile_id = response.headers["X-Profile-Id"]
+    profile = client.get(f"/admin/profiles/{profile_id}", headers={"X-Profile": "secret"}).json()
+    assert profile["context"]["endpoint"] == "/estimate"
+    assert profile["hottest_functions"]
+
+
+def test_profile_dir_is_pruned(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_DIR", str(tmp_path))
+    for _ in range(5):
+        profiling.run_profiled(sum, [1, 2])
+    profiling._prune_profile_dir(keep=2)
+    assert len(list(tmp_path.glob("*.json"))) == 2
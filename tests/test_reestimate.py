@@ -0,0 +1,77 @@
+# tests/test_reestimate.py
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.main import create_app
+from api.warmup import representative_requests
+from benchmarks.synthetic import make_valuation_requests
+from core.calculation_engine import run_full_valuation, run_valuation_with_state, reestimate
+
+REQUESTS = representative_requests() + make_valuation_requests(10, seed=2, max_buildings=4)
+
+EDITS = [
+    ({"fence_percent": 9, "water_tank_cost": 0.0}, None),
+    (None, {"plot_area": 800.0, "prop_town": "Major Cities"}),
+    ({"consultancy_percent": 1}, {"plot_area": 20000.0}),
+]
+
+
+def edited(valuation_data: dict, other_costs, property_details) -> dict:
+    return {
+        **valuation_data,
+        "other_costs": {**valuation_data["other_costs"], **(other_costs or {})},
+        "property_details": {**valuation_data["property_details"], **(property_details or {})},
+    }
+
+
+@pytest.mark.parametrize("other_costs, property_details", EDITS)
+def test_reestimate_matches_full_valuation(other_costs, property_details):
+    for valuation_data in REQUESTS:
+        results, state = run_valuation_with_state(valuation_data)
+        assert results == run_full_valuation(valuation_data)
+        results, state = reestimate(state, other_costs=other_costs, property_details=property_details)
+        assert results == run_full_valuation(edited(valuation_data, other_costs, property_details))
+
+
+def test_reestimate_rejects_inconsistent_ccw():
+    _, state = run_valuation_with_state(REQUESTS[0])
+    with pytest.raises(ValueError):
+        reestimate({**state, "ccw": state["ccw"] * 10}, other_costs={"fence_percent": 1})
+
+
+def test_reestimate_ignores_stale_stage_results():
+    _, state = run_valuation_with_state(REQUESTS[0])
+    forged = {**state, "total_other_costs": 1e12, "location": [1e12, 1e12, 1e12]}
+    assert reestimate(forged)[0] == run_full_valuation(REQUESTS[0])
+
+
+@pytest.fixture
+def client():
+    return TestClient(create_app())
+
+
+def test_delta_endpoint_round_trip(client):
+    payload = REQUESTS[0]
+    state = client.post("/estimate/state", json=payload).json()["state"]
+    assert state["signature"]
+    for other_costs, property_details in EDITS:
+        response = client.post("/estimate/delta", json={
+            "state": state, "other_costs": other_costs, "property_details": property_details})
+        assert response.status_code == 200
+        payload = edited(payload, other_costs, property_details)
+        assert response.json()["results"] == client.post("/estimate", json=payload).json()
+        state = response.json()["state"]  # chained edits keep working
+
+
+@pytest.mark.parametrize("tamper", [
+    lambda state: {**state, "building_costs": [cost * 2 for cost in state["building_costs"]],
+                   "ccw": state["ccw"] * 2},
+    lambda state: {**state, "ccw": state["ccw"] + 1},
+    lambda state: {**state, "signature": None},
+    lambda state: {**state, "signature": "é"},
+])
+def test_delta_endpoint_rejects_altered_state(client, tamper):
+    state = client.post("/estimate/state", json=REQUESTS[0]).json()["state"]
+    response = client.post("/estimate/delta", json={"state": tamper(state), "other_costs": {"fence_percent": 1}})
+    assert response.status_code == 400
@@ -4,6 +4,8 @@ import pandas as pd
 
 # --- Configuration ---
 API_URL = "http://127.0.0.1:8000/estimate"
+STATE_URL = f"{API_URL}/state"
+DELTA_URL = f"{API_URL}/delta"
 
 # --- Data for UI ---
 # In a real app, this would be fetched from an API endpoint
@@ -165,9 +167,21 @@ if submitted:
 
     try:
         with st.spinner("Calculating..."):
-            response = requests.post(API_URL, json=request_payload)
+            # When only other costs or property details changed, reuse the
+            # building costs from the previous valuation instead of recomputing them
+            if st.session_state.get("valuation_state") and st.session_state.get("valuation_buildings") == buildings_payload:
+                response = requests.post(DELTA_URL, json={
+                    "state": st.session_state["valuation_state"],
+                    "other_costs": request_payload["other_costs"],
+                    "property_details": request_payload["property_details"],
+                })
+            else:
+                response = requests.post(STATE_URL, json=request_payload)
             response.raise_for_status()
-            results = response.json()
+            valuation = response.json()
+            st.session_state["valuation_state"] = valuation["state"]
+            st.session_state["valuation_buildings"] = buildings_payload
+            results = valuation["results"]
 
             st.header("Valuation Summary & Report")
             for building_name, grade in results['suggested_grades'].items():